@@ -20,8 +20,10 @@
 #       * "ladder_baseline_usd": 5                (optional)
 #       * "schedule_enabled": true/false          (optional; default false)
 #       * "schedule_interval_secs": 900           (optional; default 900s)
-#       * "last_scheduler_heartbeat": <unix>      (optional, for status only)
-#       * "last_scheduler_error": "..."           (optional, for status only)
+#   - Scheduler runtime state lives in a sidecar file .scheduler_state.json
+#     (so heartbeats don't rewrite config.json):
+#       * "last_scheduler_heartbeat": <unix>      (status only; flushed at most every 60s)
+#       * "last_scheduler_error": "..."           (status only; written immediately)
 #
 #   - The scheduler loop is foreground & blocking. Run it in a separate shell:
 #       python controller.py schedule:run
@@ -32,12 +34,17 @@
 #
 
 import argparse
+import contextlib
+import copy
 import json
 import os
+import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import sqlite3
 import requests
@@ -45,7 +52,8 @@ import requests
 # Local modules
 from ladder import run as ladder_run, DEFAULT_USD_LADDER, DEFAULT_BASELINE_USD  # prints and returns dict result
 from db_helper import (
-    DB_PATH,
+    get_conn,
+    bulk_upsert_token_prices,
     save_ladder_result,
     list_ladder_runs,
     get_ladder_run,
@@ -53,28 +61,122 @@ from db_helper import (
     delete_ladder_run,
     upsert_token_pair,
 )
+from init_db import ensure_indexes
+from http_helper import pooled_session
+from json_helper import json_dumps, json_loads
+from token_price import birdeye_headers  # cached per (api_key, chain)
 
 CONFIG_FILE = Path("config.json")
+STATE_FILE = Path(".scheduler_state.json")
+STATE_FLUSH_SECS = 60  # min gap between heartbeat-only state writes
+RUN_ONCE_MAX_WORKERS = 8  # concurrent pairs in run_once (I/O-bound)
 
 # Birdeye helpers (mirror token_data.py behavior for auto-pair)
 BIRDEYE_MARKETS_URL = "https://public-api.birdeye.so/defi/v2/markets"
 
+# Pooled keep-alive session: reuses TCP/TLS connections across Birdeye calls
+_SESSION = pooled_session(4, 16)
+_SESSION.headers.update({"accept": "application/json", "Connection": "keep-alive"})
+
 
 # ----------------------------- Config I/O ------------------------------
 
+# Parsed config.json keyed by file mtime; callers always get a private deep copy.
+_CFG_CACHE: Dict[str, Any] = {"mtime": None, "data": None}
+
+
 def load_cfg() -> Dict[str, Any]:
-    if not CONFIG_FILE.exists():
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         sys.stderr.write("ERROR: config.json not found.\n")
         sys.exit(1)
+    if _CFG_CACHE["mtime"] == mtime:
+        return copy.deepcopy(_CFG_CACHE["data"])
     try:
-        return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+        data = json_loads(CONFIG_FILE.read_bytes())
     except Exception as e:
         sys.stderr.write(f"ERROR: failed to parse config.json: {e}\n")
         sys.exit(1)
+    _CFG_CACHE["mtime"], _CFG_CACHE["data"] = mtime, data
+    return copy.deepcopy(data)
+
+
+def save_cfg(cfg: Dict[str, Any], *, pretty: bool = False) -> None:
+    """
+    Write config.json. Compact by default (C encoder fast path, used by the
+    scheduler); pass pretty=True for human-initiated edits so the file stays readable.
+    """
+    if pretty:
+        text = json.dumps(cfg, indent=2, sort_keys=False)
+    else:
+        text = json.dumps(cfg, separators=(",", ":"))
+    CONFIG_FILE.write_text(text, encoding="utf-8")
+    _CFG_CACHE["mtime"] = CONFIG_FILE.stat().st_mtime_ns
+    _CFG_CACHE["data"] = copy.deepcopy(cfg)
+
+
+@contextlib.contextmanager
+def edit_cfg(*, pretty: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Load config once, yield it for in-place edits, and write it back once on
+    a clean exit -- only if something actually changed.
+    """
+    cfg = load_cfg()
+    snapshot = copy.deepcopy(cfg)
+    yield cfg
+    if cfg != snapshot:
+        save_cfg(cfg, pretty=pretty)
+
+
+def add_pairs_to_cfg(cfg: Dict[str, Any], pairs: List[str]) -> List[str]:
+    """Append pairs missing from cfg['pair_addresses'] (order kept); returns those added."""
+    addrs = get_cfg_list(cfg, "pair_addresses")
+    seen = set(addrs)  # O(1) membership for the whole batch
+    added = []
+    for p in pairs:
+        if p not in seen:
+            seen.add(p)
+            addrs.append(p)
+            added.append(p)
+    if added:
+        cfg["pair_addresses"] = addrs
+    return added
+
+
+def read_state() -> Dict[str, Any]:
+    """Scheduler heartbeat/error sidecar; {} if missing or unreadable."""
+    try:
+        data = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_state(state: Dict[str, Any]) -> None:
+    """Atomically replace the scheduler state sidecar."""
+    tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, STATE_FILE)
+
 
+def scheduler_status(cfg: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+    """(last heartbeat, last error) from the sidecar, falling back to legacy config keys."""
+    state = read_state()
+    beat = state.get("last_scheduler_heartbeat", cfg.get("last_scheduler_heartbeat"))
+    err = state.get("last_scheduler_error", cfg.get("last_scheduler_error"))
+    return beat, err
 
-def save_cfg(cfg: Dict[str, Any]) -> None:
-    CONFIG_FILE.write_text(json.dumps(cfg, indent=2, sort_keys=False), encoding="utf-8")
+
+def _touch_heartbeat() -> None:
+    state = read_state()
+    state["last_scheduler_heartbeat"] = int(time.time())
+    write_state(state)
+
+
+def _print_json(obj: Any) -> None:
+    """Pretty-print obj as JSON to stdout with one write."""
+    sys.stdout.write(json_dumps(obj, indent=True) + "\n")
 
 
 def get_cfg_list(cfg: Dict[str, Any], key: str) -> List[Any]:
@@ -83,6 +185,8 @@ def get_cfg_list(cfg: Dict[str, Any], key: str) -> List[Any]:
 
 
 def ensure_defaults(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    # Always check the dict we were given (it may not come from load_cfg());
+    # four membership tests are cheap, and config.json is only written on a change
     changed = False
     if "ladder_values" not in cfg:
         cfg["ladder_values"] = list(DEFAULT_USD_LADDER)
@@ -97,42 +201,47 @@ def ensure_defaults(cfg: Dict[str, Any]) -> Dict[str, Any]:
         cfg["schedule_enabled"] = False
         changed = True
     if changed:
-        save_cfg(cfg)
+        save_cfg(cfg, pretty=True)
     return cfg
 
 
 # ----------------------------- Pair Management ------------------------------
 
+SQL_LIST_PAIRS = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address, quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+ORDER BY base_symbol, quote_symbol, pair_address
+"""
+
+SQL_PAIR_ADDRESSES = "SELECT pair_address FROM token_pairs ORDER BY pair_address"
+
+SQL_DELETE_PAIR = "DELETE FROM token_pairs WHERE base_address = ? AND pair_address = ?"
+
+
 def list_pairs() -> List[dict]:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.execute(
-            """
-            SELECT base_address, base_symbol, base_decimals,
-                   pair_address, quote_address, quote_symbol, quote_decimals
-            FROM token_pairs
-            ORDER BY base_symbol, quote_symbol, pair_address
-            """
-        )
-        return [dict(r) for r in cur.fetchall()]
+    cur = get_conn().execute(SQL_LIST_PAIRS)
+    return [dict(r) for r in cur]
+
+
+def list_pair_addresses() -> List[str]:
+    """All pair addresses (single column; served by idx_token_pairs_pair)."""
+    return [r[0] for r in get_conn().execute(SQL_PAIR_ADDRESSES)]
 
 
 def remove_pair(base_address: str, pair_address: str) -> int:
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.execute(
-            "DELETE FROM token_pairs WHERE base_address = ? AND pair_address = ?",
-            (base_address, pair_address),
-        )
-        conn.commit()
-        return cur.rowcount
+    # autocommit connection: the DELETE commits on its own
+    cur = get_conn().execute(SQL_DELETE_PAIR, (base_address, pair_address))
+    return cur.rowcount
 
 
 def birdeye_get_markets(api_key: str, token_ca: str, chain_name: str = "base") -> List[Dict[str, Any]]:
-    headers = {"accept": "application/json", "X-API-KEY": api_key, "x-chain": chain_name}
-    r = requests.get(BIRDEYE_MARKETS_URL, headers=headers, params={"address": token_ca}, timeout=20)
+    # per-request headers: the module session is shared, so it must not carry a caller's key/chain
+    r = _SESSION.get(BIRDEYE_MARKETS_URL, headers=birdeye_headers(api_key, chain_name),
+                     params={"address": token_ca}, timeout=20, stream=False)
     if r.status_code != 200:
-        raise RuntimeError(f"Birdeye request failed [{r.status_code}]: {r.text[:300]}")
-    obj = r.json()
+        raise RuntimeError(f"Birdeye request failed [{r.status_code}]: {r.content[:300].decode('utf-8', 'replace')}")
+    obj = json_loads(r.content)  # parse bytes directly; skips requests' text decode
     markets = obj.get("data") or obj.get("markets") or []
     if isinstance(markets, dict):
         markets = markets.get("items") or markets.get("list") or markets
@@ -143,15 +252,17 @@ def birdeye_get_markets(api_key: str, token_ca: str, chain_name: str = "base") -
     return markets
 
 
+def _safe_liq(m: Dict[str, Any]) -> float:
+    v = m.get("liquidity")
+    try:
+        return float(v) if v is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
 def pick_largest_liquidity(markets: List[Dict[str, Any]]) -> Dict[str, Any]:
-    best, best_liq = None, -1.0
-    for m in markets:
-        try:
-            liq = float(m.get("liquidity") or 0.0)
-        except Exception:
-            liq = 0.0
-        if liq > best_liq:
-            best, best_liq = m, liq
+    # max() keeps the first of equal maxima, same as the old strict ">" scan
+    best = max(markets, key=_safe_liq, default=None)
     if not best:
         raise ValueError("No market with liquidity found.")
     return best
@@ -205,23 +316,6 @@ def add_pair_auto(token_ca: str) -> Tuple[str, str]:
 
 # ----------------------------- Ladder & Scheduler ------------------------------
 
-def apply_pair_override_for_run(pair_address: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    """
-    Temporarily override cfg['pair_addresses'] to target a specific pair for the next run.
-    Returns (original_cfg, temp_cfg). The caller should restore original after run.
-    """
-    original = load_cfg()
-    tmp = dict(original)
-    if pair_address:
-        tmp["pair_addresses"] = [pair_address]
-    save_cfg(tmp)
-    return original, tmp
-
-
-def restore_cfg(cfg: Dict[str, Any]) -> None:
-    save_cfg(cfg)
-
-
 def run_once(pair: Optional[str], use_all: bool, override_ladder: Optional[List[int]], override_baseline: Optional[int]) -> List[int]:
     """
     Run ladder once for one or all pairs listed in config["pair_addresses"] (or all DB pairs if --all).
@@ -233,40 +327,93 @@ def run_once(pair: Optional[str], use_all: bool, override_ladder: Optional[List[
     targets: List[str]
     if use_all:
         # Collect all pairs from DB
-        targets = [row["pair_address"] for row in list_pairs()]
+        targets = list_pair_addresses()
     else:
         targets = [pair] if pair else get_cfg_list(cfg, "pair_addresses")
         if not targets:
             raise SystemExit("No target pair found. Use --pair or set config.pair_addresses.")
 
-    # Apply ladder overrides in config.json (read by ladder.run)
-    if override_ladder is not None:
-        cfg["ladder_values"] = list(map(int, override_ladder))
-    if override_baseline is not None:
-        cfg["ladder_baseline_usd"] = int(override_baseline)
-    save_cfg(cfg)
-
-    run_ids: List[int] = []
-    for p in targets:
-        # Temporarily set pair_addresses to the single pair, then restore after run
-        orig_cfg, _tmp = apply_pair_override_for_run(p)
+    # Ladder overrides apply to this call only; they are passed straight to ladder.run
+    ladder = list(map(int, override_ladder)) if override_ladder is not None else (cfg.get("ladder_values") or list(DEFAULT_USD_LADDER))
+    baseline = int(override_baseline) if override_baseline is not None else int(cfg.get("ladder_baseline_usd", DEFAULT_BASELINE_USD))
+
+    # --all on an empty DB is a no-op (ThreadPoolExecutor rejects max_workers=0)
+    if not targets:
+        return []
+
+    # Pairs are I/O-bound (0x/Birdeye HTTP), so run them concurrently; the
+    # 0x rate limit is enforced process-wide inside quote.get_price. Each run is
+    # persisted on this thread as soon as it finishes, so a Ctrl-C or a failed
+    # save never discards the runs that already completed.
+    slots: List[Optional[int]] = [None] * len(targets)
+    with ThreadPoolExecutor(max_workers=min(RUN_ONCE_MAX_WORKERS, len(targets))) as ex:
+        futures = {
+            ex.submit(ladder_run, usd_ladder=ladder, baseline_usd=baseline, pair_address=p, cache_prices=False): i
+            for i, p in enumerate(targets)
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                # Call ladder runner (prints table)
+                result = fut.result()
+            except Exception as e:
+                print(f"[warn] ladder run failed for {targets[i]}: {e}")
+                continue
+
+            # Cache BASE_USD (ladder_run was told not to upsert from its worker thread)
+            base = result["pair"]["base"]
+            try:
+                bulk_upsert_token_prices([(base["address"], base["symbol"], result["prices"]["base_usd"])])
+            except Exception as e:
+                print(f"[warn] failed to cache BASE_USD price: {e}")
+
+            try:
+                slots[i] = save_ladder_result(result)
+            except Exception as e:
+                print(f"[warn] failed to save ladder run for {targets[i]}: {e}")
+                continue
+            print(f"\n[ok] saved ladder run_id: {slots[i]} for pair {result['pair']['pair_address']}")
+
+    # run_ids in target order
+    return [rid for rid in slots if rid is not None]
+
+
+# Scheduler wakeups: _stop ends the loop (Ctrl-C); _wake interrupts the current
+# wait (config.json changed, or stop requested) so the loop re-reads settings.
+_stop = threading.Event()
+_wake = threading.Event()
+CONFIG_POLL_SECS = 1.0
+
+
+def _wait(seconds: float) -> bool:
+    """Interruptible sleep; returns True if the scheduler should stop."""
+    _wake.wait(max(0.0, seconds))
+    _wake.clear()
+    return _stop.is_set()
+
+
+def _on_sigint(_signum, _frame) -> None:
+    if _stop.is_set():
+        raise KeyboardInterrupt  # second Ctrl-C: abort the current run
+    print("\n[scheduler] stopping after current step … (Ctrl-C again to abort)")
+    _stop.set()
+    _wake.set()
+
+
+def _watch_config() -> None:
+    """Daemon: wake the scheduler when config.json's mtime changes."""
+    try:
+        last = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        last = None
+    while not _stop.wait(CONFIG_POLL_SECS):
         try:
-            # Call ladder runner (prints table)
-            result = ladder_run(
-                usd_ladder=cfg.get("ladder_values") or list(DEFAULT_USD_LADDER),
-                baseline_usd=int(cfg.get("ladder_baseline_usd", DEFAULT_BASELINE_USD)),
-            )
-            rid = save_ladder_result(result)
-            run_ids.append(rid)
-            print(f"\n[ok] saved ladder run_id: {rid} for pair {p}")
-        except KeyboardInterrupt:
-            raise
-        except Exception as e:
-            print(f"[warn] ladder run failed for {p}: {e}")
-        finally:
-            restore_cfg(orig_cfg)
-            time.sleep(1.0)  # small gap between pairs
-    return run_ids
+            mtime = CONFIG_FILE.stat().st_mtime_ns
+        except OSError:
+            continue
+        if mtime != last:
+            last = mtime
+            _wake.set()
 
 
 def scheduler_loop() -> None:
@@ -277,60 +424,121 @@ def scheduler_loop() -> None:
       - ladder_values: list[int]
       - ladder_baseline_usd: int
       - pair_addresses: list[str] (targets). If empty, uses all DB pairs.
+    Waits are interruptible: Ctrl-C stops the loop and config.json edits
+    (enable/disable/interval) take effect within ~1s.
     """
     print("[scheduler] starting … Ctrl-C to stop")
-    while True:
-        cfg = ensure_defaults(load_cfg())
-        enabled = bool(cfg.get("schedule_enabled", False))
-        interval = int(cfg.get("schedule_interval_secs", 900))
-        if not enabled:
-            print("[scheduler] disabled; sleeping 10s … (use schedule:enable)")
-            time.sleep(10)
-            continue
-
-        try:
-            # decide targets
-            targets = get_cfg_list(cfg, "pair_addresses")
-            if not targets:
-                targets = [row["pair_address"] for row in list_pairs()]
-            if not targets:
-                print("[scheduler] no pairs found; sleeping")
-                time.sleep(interval)
+    state = read_state()
+    last_state_write = 0.0
+    last_done: Optional[float] = None  # monotonic time the previous cycle finished
+
+    _stop.clear()
+    _wake.clear()
+    prev_handler = signal.signal(signal.SIGINT, _on_sigint)
+    watcher = threading.Thread(target=_watch_config, name="config-watch", daemon=True)
+    watcher.start()
+    try:
+        while not _stop.is_set():
+            cfg = ensure_defaults(load_cfg())
+            enabled = bool(cfg.get("schedule_enabled", False))
+            interval = int(cfg.get("schedule_interval_secs", 900))
+            if not enabled:
+                print("[scheduler] disabled; waiting … (use schedule:enable)")
+                if _wait(10):
+                    break
                 continue
 
-            print(f"[scheduler] running for {len(targets)} pair(s) …")
-            created = run_once(pair=None, use_all=True, override_ladder=None, override_baseline=None)
-            print(f"[scheduler] runs created: {created}")
+            # honor the (possibly just changed) interval since the last cycle
+            if last_done is not None:
+                remaining = last_done + interval - time.monotonic()
+                if remaining > 0:
+                    if _wait(remaining):
+                        break
+                    continue
 
-            cfg["last_scheduler_heartbeat"] = int(time.time())
-            cfg.pop("last_scheduler_error", None)
-            save_cfg(cfg)
-        except KeyboardInterrupt:
-            print("\n[scheduler] interrupted; exiting")
-            break
-        except Exception as e:
-            print(f"[scheduler] error: {e}")
-            cfg["last_scheduler_error"] = str(e)
-            cfg["last_scheduler_heartbeat"] = int(time.time())
-            save_cfg(cfg)
-
-        # sleep until next cycle
-        time.sleep(interval)
+            try:
+                # decide targets
+                targets = get_cfg_list(cfg, "pair_addresses")
+                if not targets:
+                    targets = list_pair_addresses()
+                if not targets:
+                    print("[scheduler] no pairs found; sleeping")
+                    last_done = time.monotonic()
+                    continue
+
+                print(f"[scheduler] running for {len(targets)} pair(s) …")
+                created = run_once(pair=None, use_all=True, override_ladder=None, override_baseline=None)
+                print(f"[scheduler] runs created: {created}")
+
+                now = time.time()
+                state["last_scheduler_heartbeat"] = int(now)
+                cleared = state.pop("last_scheduler_error", None) is not None
+                if cleared or now - last_state_write >= STATE_FLUSH_SECS:
+                    write_state(state)
+                    last_state_write = now
+            except Exception as e:
+                print(f"[scheduler] error: {e}")
+                now = time.time()
+                state["last_scheduler_error"] = str(e)
+                state["last_scheduler_heartbeat"] = int(now)
+                write_state(state)
+                last_state_write = now
+
+            # next cycle is due `interval` seconds from now
+            last_done = time.monotonic()
+    except KeyboardInterrupt:
+        print("\n[scheduler] interrupted; exiting")
+    finally:
+        _stop.set()  # also ends the config watcher
+        watcher.join(timeout=CONFIG_POLL_SECS * 2)
+        signal.signal(signal.SIGINT, prev_handler)
+    print("[scheduler] stopped")
 
 
 # ----------------------------- CLI Handlers ------------------------------
 
+PAIRS_HEADER = "base_symbol base_address                               pair_address                                quote_symbol quote_address                              decs"
+RUNS_HEADER = "id     started_at  base_symbol  quote_symbol  pair_address"
+
+# Bound str.format templates: the format string is parsed once, not per row
+_PAIR_ROW_FMT = "{bs:<11} {ba:<42} {pa:<42} {qs:<12} {qa:<42} {bd}/{qd}".format
+_RUN_ROW_FMT = "{id:<6} {ts:<11} {bs:<11} {qs:<12} {pa}".format
+
+
+def _render_pairs(rows: List[dict]) -> None:
+    """Write the pairs table (header + rows) with a single stdout write."""
+    lines = [PAIRS_HEADER]
+    lines.extend(
+        _PAIR_ROW_FMT(
+            bs=r["base_symbol"] or "-", ba=r["base_address"], pa=r["pair_address"],
+            qs=r["quote_symbol"] or "-", qa=r["quote_address"],
+            bd=r["base_decimals"], qd=r["quote_decimals"],
+        )
+        for r in rows
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _render_runs(rows: List[dict]) -> None:
+    """Write the runs table (header + rows) with a single stdout write."""
+    lines = [RUNS_HEADER]
+    lines.extend(
+        _RUN_ROW_FMT(
+            id=r["id"], ts=r["started_at"], bs=r["base_symbol"] or "-",
+            qs=r["quote_symbol"] or "-", pa=r["pair_address"],
+        )
+        for r in rows
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def cmd_pairs_add_auto(args: argparse.Namespace) -> None:
     base_addr, pair_addr = add_pair_auto(args.token)
     print(f"[ok] upserted pair (base={base_addr}, pair={pair_addr})")
     if args.add_to_config:
-        cfg = load_cfg()
-        addrs = get_cfg_list(cfg, "pair_addresses")
-        if pair_addr not in addrs:
-            addrs.append(pair_addr)
-            cfg["pair_addresses"] = addrs
-            save_cfg(cfg)
-            print(f"[ok] added pair to config.pair_addresses: {pair_addr}")
+        with edit_cfg() as cfg:
+            if add_pairs_to_cfg(cfg, [pair_addr]):
+                print(f"[ok] added pair to config.pair_addresses: {pair_addr}")
 
 
 def cmd_pairs_add_manual(args: argparse.Namespace) -> None:
@@ -345,23 +553,18 @@ def cmd_pairs_add_manual(args: argparse.Namespace) -> None:
     )
     print("[ok] upserted token pair")
     if args.add_to_config:
-        cfg = load_cfg()
-        addrs = get_cfg_list(cfg, "pair_addresses")
-        if args.pair not in addrs:
-            addrs.append(args.pair)
-            cfg["pair_addresses"] = addrs
-            save_cfg(cfg)
-            print(f"[ok] added pair to config.pair_addresses: {args.pair}")
+        with edit_cfg() as cfg:
+            if add_pairs_to_cfg(cfg, [args.pair]):
+                print(f"[ok] added pair to config.pair_addresses: {args.pair}")
 
 
 def cmd_pairs_remove(args: argparse.Namespace) -> None:
     n = remove_pair(args.base, args.pair)
     print(f"[ok] removed {n} row(s) from token_pairs")
     # Also remove from config list if present
-    cfg = load_cfg()
-    addrs = [x for x in get_cfg_list(cfg, "pair_addresses") if x.lower() != args.pair.lower()]
-    cfg["pair_addresses"] = addrs
-    save_cfg(cfg)
+    target = args.pair.lower()
+    with edit_cfg() as cfg:
+        cfg["pair_addresses"] = [x for x in get_cfg_list(cfg, "pair_addresses") if x.lower() != target]
 
 
 def cmd_pairs_list(_args: argparse.Namespace) -> None:
@@ -369,24 +572,20 @@ def cmd_pairs_list(_args: argparse.Namespace) -> None:
     if not rows:
         print("(no pairs)")
         return
-    print("base_symbol base_address                               pair_address                                quote_symbol quote_address                              decs")
-    for r in rows:
-        print(f"{(r['base_symbol'] or '-'):<11} {r['base_address']:<42} {r['pair_address']:<42} {(r['quote_symbol'] or '-'):<12} {r['quote_address']:<42} {r['base_decimals']}/{r['quote_decimals']}")
+    _render_pairs(rows)
 
 
 def cmd_ladder_set(args: argparse.Namespace) -> None:
     vals = [int(x) for x in args.values.split(",") if x.strip()]
-    cfg = load_cfg()
-    cfg["ladder_values"] = vals
-    save_cfg(cfg)
+    with edit_cfg() as cfg:
+        cfg["ladder_values"] = vals
     print(f"[ok] set ladder_values = {vals}")
 
 
 def cmd_ladder_default(_args: argparse.Namespace) -> None:
-    cfg = load_cfg()
-    cfg["ladder_values"] = list(DEFAULT_USD_LADDER)
-    cfg["ladder_baseline_usd"] = int(DEFAULT_BASELINE_USD)
-    save_cfg(cfg)
+    with edit_cfg() as cfg:
+        cfg["ladder_values"] = list(DEFAULT_USD_LADDER)
+        cfg["ladder_baseline_usd"] = int(DEFAULT_BASELINE_USD)
     print("[ok] restored default ladder & baseline")
 
 
@@ -397,9 +596,8 @@ def cmd_ladder_show(_args: argparse.Namespace) -> None:
 
 
 def cmd_ladder_baseline(args: argparse.Namespace) -> None:
-    cfg = load_cfg()
-    cfg["ladder_baseline_usd"] = int(args.usd)
-    save_cfg(cfg)
+    with edit_cfg() as cfg:
+        cfg["ladder_baseline_usd"] = int(args.usd)
     print(f"[ok] set ladder_baseline_usd = {args.usd}")
 
 
@@ -417,9 +615,7 @@ def cmd_runs_list(args: argparse.Namespace) -> None:
     if not rows:
         print("(no runs)")
         return
-    print("id     started_at  base_symbol  quote_symbol  pair_address")
-    for r in rows:
-        print(f"{r['id']:<6} {r['started_at']:<11} {(r['base_symbol'] or '-'):<11} {(r['quote_symbol'] or '-'):<12} {r['pair_address']}")
+    _render_runs(rows)
 
 
 def cmd_runs_show(args: argparse.Namespace) -> None:
@@ -428,7 +624,7 @@ def cmd_runs_show(args: argparse.Namespace) -> None:
         print("run not found")
         return
     pts = get_ladder_points(run["id"])
-    print(json.dumps({"run": run, "points": pts}, indent=2))
+    _print_json({"run": run, "points": pts})
 
 
 def cmd_runs_delete(args: argparse.Namespace) -> None:
@@ -441,24 +637,21 @@ def cmd_schedule_run(_args: argparse.Namespace) -> None:
 
 
 def cmd_schedule_enable(_args: argparse.Namespace) -> None:
-    cfg = load_cfg()
-    cfg["schedule_enabled"] = True
-    cfg["last_scheduler_heartbeat"] = int(time.time())
-    save_cfg(cfg)
+    with edit_cfg() as cfg:
+        cfg["schedule_enabled"] = True
+    _touch_heartbeat()
     print("[ok] scheduler enabled")
 
 
 def cmd_schedule_disable(_args: argparse.Namespace) -> None:
-    cfg = load_cfg()
-    cfg["schedule_enabled"] = False
-    save_cfg(cfg)
+    with edit_cfg() as cfg:
+        cfg["schedule_enabled"] = False
     print("[ok] scheduler disabled")
 
 
 def cmd_schedule_set_interval(args: argparse.Namespace) -> None:
-    cfg = load_cfg()
-    cfg["schedule_interval_secs"] = int(args.seconds)
-    save_cfg(cfg)
+    with edit_cfg() as cfg:
+        cfg["schedule_interval_secs"] = int(args.seconds)
     print(f"[ok] scheduler interval = {args.seconds}s")
 
 
@@ -466,14 +659,13 @@ def cmd_schedule_status(_args: argparse.Namespace) -> None:
     cfg = ensure_defaults(load_cfg())
     enabled = cfg.get("schedule_enabled", False)
     interval = cfg.get("schedule_interval_secs", 900)
-    beat = cfg.get("last_scheduler_heartbeat")
-    err = cfg.get("last_scheduler_error")
-    print(json.dumps({
+    beat, err = scheduler_status(cfg)
+    _print_json({
         "enabled": enabled,
         "interval_secs": interval,
         "last_scheduler_heartbeat": beat,
         "last_scheduler_error": err
-    }, indent=2))
+    })
 
 
 # ----------------------------- Interactive Menu ------------------------------
@@ -508,13 +700,9 @@ def menu_pairs() -> None:
                 base_addr, pair_addr = add_pair_auto(token)
                 print(f"[ok] upserted pair base={base_addr}, pair={pair_addr}")
                 if add_to_cfg:
-                    cfg = load_cfg()
-                    addrs = get_cfg_list(cfg, "pair_addresses")
-                    if pair_addr not in addrs:
-                        addrs.append(pair_addr)
-                        cfg["pair_addresses"] = addrs
-                        save_cfg(cfg)
-                        print(f"[ok] added pair to config: {pair_addr}")
+                    with edit_cfg() as cfg:
+                        if add_pairs_to_cfg(cfg, [pair_addr]):
+                            print(f"[ok] added pair to config: {pair_addr}")
             except Exception as e:
                 print(f"[err] {e}")
             _press_enter()
@@ -534,13 +722,9 @@ def menu_pairs() -> None:
                 )
                 print("[ok] upserted token pair")
                 if add_to_cfg:
-                    cfg = load_cfg()
-                    addrs = get_cfg_list(cfg, "pair_addresses")
-                    if pair not in addrs:
-                        addrs.append(pair)
-                        cfg["pair_addresses"] = addrs
-                        save_cfg(cfg)
-                        print(f"[ok] added pair to config: {pair}")
+                    with edit_cfg() as cfg:
+                        if add_pairs_to_cfg(cfg, [pair]):
+                            print(f"[ok] added pair to config: {pair}")
             except Exception as e:
                 print(f"[err] {e}")
             _press_enter()
@@ -550,10 +734,9 @@ def menu_pairs() -> None:
             try:
                 n = remove_pair(base, pair)
                 print(f"[ok] removed {n} row(s) from token_pairs")
-                cfg = load_cfg()
-                addrs = [x for x in get_cfg_list(cfg, "pair_addresses") if x.lower() != pair.lower()]
-                cfg["pair_addresses"] = addrs
-                save_cfg(cfg)
+                target = pair.lower()
+                with edit_cfg() as cfg:
+                    cfg["pair_addresses"] = [x for x in get_cfg_list(cfg, "pair_addresses") if x.lower() != target]
             except Exception as e:
                 print(f"[err] {e}")
             _press_enter()
@@ -562,9 +745,7 @@ def menu_pairs() -> None:
             if not rows:
                 print("(no pairs)")
             else:
-                print("base_symbol base_address                               pair_address                                quote_symbol quote_address                              decs")
-                for r in rows:
-                    print(f"{(r['base_symbol'] or '-'):<11} {r['base_address']:<42} {r['pair_address']:<42} {(r['quote_symbol'] or '-'):<12} {r['quote_address']:<42} {r['base_decimals']}/{r['quote_decimals']}")
+                _render_pairs(rows)
             _press_enter()
         elif choice == "5":
             return
@@ -587,22 +768,22 @@ def menu_ladder() -> None:
             raw = _input('Enter values (comma separated, e.g., "1,5,10,25"): ').strip()
             try:
                 vals = [int(x) for x in raw.split(",") if x.strip()]
-                cfg["ladder_values"] = vals
-                save_cfg(cfg)
+                with edit_cfg() as cfg:
+                    cfg["ladder_values"] = vals
                 print(f"[ok] set ladder_values = {vals}")
             except Exception as e:
                 print(f"[err] {e}")
             _press_enter()
         elif choice == "2":
-            cfg["ladder_values"] = list(DEFAULT_USD_LADDER)
-            cfg["ladder_baseline_usd"] = int(DEFAULT_BASELINE_USD)
-            save_cfg(cfg)
+            with edit_cfg() as cfg:
+                cfg["ladder_values"] = list(DEFAULT_USD_LADDER)
+                cfg["ladder_baseline_usd"] = int(DEFAULT_BASELINE_USD)
             print("[ok] restored defaults")
             _press_enter()
         elif choice == "3":
             usd = int(_input("Baseline USD (e.g., 5): ").strip() or "5")
-            cfg["ladder_baseline_usd"] = usd
-            save_cfg(cfg)
+            with edit_cfg() as cfg:
+                cfg["ladder_baseline_usd"] = usd
             print(f"[ok] baseline set = {usd}")
             _press_enter()
         elif choice == "4":
@@ -662,9 +843,7 @@ def menu_runs() -> None:
             if not rows:
                 print("(no runs)")
             else:
-                print("id     started_at  base_symbol  quote_symbol  pair_address")
-                for r in rows:
-                    print(f"{r['id']:<6} {r['started_at']:<11} {(r['base_symbol'] or '-'):<11} {(r['quote_symbol'] or '-'):<12} {r['pair_address']}")
+                _render_runs(rows)
             _press_enter()
         elif choice == "2":
             rid = int(_input("Run ID: ").strip())
@@ -673,7 +852,7 @@ def menu_runs() -> None:
                 print("run not found")
             else:
                 pts = get_ladder_points(run["id"])
-                print(json.dumps({"run": run, "points": pts}, indent=2))
+                _print_json({"run": run, "points": pts})
             _press_enter()
         elif choice == "3":
             rid = int(_input("Run ID to delete: ").strip())
@@ -689,11 +868,12 @@ def menu_runs() -> None:
 def menu_scheduler() -> None:
     while True:
         cfg = ensure_defaults(load_cfg())
+        beat, err = scheduler_status(cfg)
         print("\n[Scheduler]\n"
               f"  Enabled: {cfg.get('schedule_enabled', False)}\n"
               f"  Interval secs: {cfg.get('schedule_interval_secs', 900)}\n"
-              f"  Last heartbeat: {cfg.get('last_scheduler_heartbeat')}\n"
-              f"  Last error: {cfg.get('last_scheduler_error')}\n"
+              f"  Last heartbeat: {beat}\n"
+              f"  Last error: {err}\n"
               "  1) Enable\n"
               "  2) Disable\n"
               "  3) Set interval\n"
@@ -701,20 +881,20 @@ def menu_scheduler() -> None:
               "  5) Back")
         choice = _input("> ").strip()
         if choice == "1":
-            cfg["schedule_enabled"] = True
-            cfg["last_scheduler_heartbeat"] = int(time.time())
-            save_cfg(cfg)
+            with edit_cfg() as cfg:
+                cfg["schedule_enabled"] = True
+            _touch_heartbeat()
             print("[ok] enabled")
             _press_enter()
         elif choice == "2":
-            cfg["schedule_enabled"] = False
-            save_cfg(cfg)
+            with edit_cfg() as cfg:
+                cfg["schedule_enabled"] = False
             print("[ok] disabled")
             _press_enter()
         elif choice == "3":
             secs = int(_input("Interval seconds: ").strip() or "900")
-            cfg["schedule_interval_secs"] = secs
-            save_cfg(cfg)
+            with edit_cfg() as cfg:
+                cfg["schedule_interval_secs"] = secs
             print(f"[ok] interval set = {secs}s")
             _press_enter()
         elif choice == "4":
@@ -757,7 +937,10 @@ def menu_loop() -> None:
 # ----------------------------- CLI ------------------------------
 
 def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(description="Ladder Controller (pairs, ladder, scheduler, runs, menu)")
+    p = argparse.ArgumentParser(
+        description="Ladder Controller (pairs, ladder, scheduler, runs, menu)",
+        epilog="Environment: DLI_DB_PATH overrides config.json's db_path (SQLite file).",
+    )
     sub = p.add_subparsers(dest="cmd", required=True)
 
     # pairs:add-auto
@@ -858,8 +1041,17 @@ def build_parser() -> argparse.ArgumentParser:
     return p
 
 
+def _ensure_indexes() -> None:
+    """Apply hot-path indexes once per process (no-op if they already exist)."""
+    try:
+        ensure_indexes(get_conn())
+    except sqlite3.OperationalError:
+        pass  # schema not initialized yet (run init_db.py)
+
+
 def main(argv: Optional[List[str]] = None) -> None:
     ensure_defaults(load_cfg())
+    _ensure_indexes()
     parser = build_parser()
     args = parser.parse_args(argv)
     args.func(args)
@@ -1,23 +1,137 @@
 #!/usr/bin/env python3
 # db_helper.py
 
+import contextlib
 import json
+import os
 import sqlite3
+import threading
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Iterable, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+from json_helper import json_loads
+
+__all__ = [
+    "DB_PATH",
+    "get_conn",
+    "open_conn",
+    "upsert_token_pair",
+    "upsert_token_price",
+    "bulk_upsert_token_prices",
+    "get_token_price",
+    "create_ladder_run",
+    "insert_ladder_point",
+    "bulk_insert_ladder_points",
+    "get_ladder_run",
+    "list_ladder_runs",
+    "get_ladder_points_raw",
+    "get_ladder_points_columns",
+    "get_ladder_points",
+    "delete_ladder_run",
+    "save_ladder_result",
+    "save_ladder_results_bulk",
+]
 
 CONFIG_FILE = Path("config.json")
 
+@lru_cache(maxsize=1)
+def _read_cfg(mtime_ns: int) -> Dict[str, Any]:
+    """Parsed config.json, memoized on its mtime (callers pass the current st_mtime_ns)."""
+    return json_loads(CONFIG_FILE.read_bytes())
+
 def _load_db_path() -> str:
     try:
-        cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+        cfg = _read_cfg(CONFIG_FILE.stat().st_mtime_ns)
         return cfg.get("db_path", "liquidity.db")
     except FileNotFoundError:
         return "liquidity.db"
     except Exception:
         return "liquidity.db"
 
-DB_PATH = _load_db_path()
+# DLI_DB_PATH overrides config.json's db_path and skips reading the config at import
+DB_PATH = os.environ.get("DLI_DB_PATH") or _load_db_path()
+
+
+# ============================================================
+# SHARED CONNECTION (one per thread, closed when that thread exits)
+# ============================================================
+
+_CONN_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",     # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",   # 256 MiB memory-mapped reads
+    "PRAGMA busy_timeout=5000",     # wait on a concurrent writer instead of failing
+    "PRAGMA foreign_keys=ON",       # set once here; helpers no longer repeat it
+)
+
+_CONN_SETUP_SQL = ";\n".join(_CONN_PRAGMAS) + ";"
+
+_local = threading.local()
+
+def open_conn() -> sqlite3.Connection:
+    """
+    Open a new connection with the shared pragma profile (WAL, NORMAL sync, mmap, ...).
+    Autocommit mode (isolation_level=None); rows come back as sqlite3.Row.
+    Prefer get_conn(); this is for tools that manage their own connection lifetime.
+    """
+    # cached_statements: sqlite3 keeps prepared statements in an LRU keyed by
+    # SQL text; every helper passes its module-level SQL_* constant, so repeat
+    # calls skip parse/plan.
+    conn = sqlite3.connect(
+        DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256,
+    )
+    conn.executescript(_CONN_SETUP_SQL)  # all pragmas in one call
+    conn.row_factory = sqlite3.Row
+    return conn
+
+class _ConnHolder:
+    """Owns one thread's connection; only the thread-local refers to it."""
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+def get_conn() -> sqlite3.Connection:
+    """
+    Return this thread's pooled connection (see open_conn), opening it on first use.
+    It is closed when the thread exits (its thread-local holder is dropped) or at
+    interpreter exit, so short-lived pool workers don't leak handles.
+    """
+    holder = getattr(_local, "holder", None)
+    if holder is None:
+        conn = open_conn()
+        holder = _ConnHolder(conn)
+        weakref.finalize(holder, conn.close)  # also runs at exit for still-live threads
+        _local.holder = holder
+    return holder.conn
+
+def _tuple_cursor() -> sqlite3.Cursor:
+    """Cursor on the pooled connection that yields plain tuples instead of sqlite3.Row."""
+    cur = get_conn().cursor()
+    cur.row_factory = None
+    return cur
+
+@contextlib.contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    """
+    BEGIN IMMEDIATE ... COMMIT on the pooled connection (ROLLBACK on error).
+    Re-entrant: nested use joins the outer transaction.
+    """
+    conn = get_conn()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 # ============================================================
@@ -48,17 +162,15 @@ def upsert_token_pair(
     quote_symbol: Optional[str],
     quote_decimals: int,
 ) -> None:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("PRAGMA foreign_keys=ON")
-        conn.execute(
-            SQL_UPSERT_TOKEN_PAIR,
-            (
-                base_address, base_symbol, int(base_decimals),
-                pair_address,
-                quote_address, quote_symbol, int(quote_decimals),
-            ),
-        )
-        conn.commit()
+    # autocommit connection: a single statement commits on its own
+    get_conn().execute(
+        SQL_UPSERT_TOKEN_PAIR,
+        (
+            base_address, base_symbol, int(base_decimals),
+            pair_address,
+            quote_address, quote_symbol, int(quote_decimals),
+        ),
+    )
 
 
 # --- LIVE PRICE HELPERS ---
@@ -67,9 +179,9 @@ SQL_UPSERT_TOKEN_PRICE = """
 INSERT INTO token_prices_live (ca, symbol, price)
 VALUES (?, ?, ?)
 ON CONFLICT(ca) DO UPDATE SET
-  symbol = excluded.symbol,
-  price  = excluded.price;
--- timestamp auto-updated by trigger in schema
+  symbol    = excluded.symbol,
+  price     = excluded.price,
+  timestamp = strftime('%s','now')
 """
 
 SQL_SELECT_TOKEN_PRICE = """
@@ -83,28 +195,30 @@ def upsert_token_price(*, ca: str, symbol: Optional[str], price: float) -> None:
     Upsert the live price for a token (one row per CA).
     Respects the exact 'ca' casing you pass in (no normalization).
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("PRAGMA foreign_keys=ON")
-        conn.execute(SQL_UPSERT_TOKEN_PRICE, (ca, symbol, float(price)))
-        conn.commit()
+    get_conn().execute(SQL_UPSERT_TOKEN_PRICE, (ca, symbol, float(price)))
+
+def bulk_upsert_token_prices(rows: Iterable[Tuple[str, Optional[str], float]]) -> None:
+    """
+    Upsert many live prices in one transaction.
+    Each row is: (ca, symbol, price)
+    """
+    with _transaction() as conn:
+        conn.executemany(SQL_UPSERT_TOKEN_PRICE, ((ca, symbol, float(price)) for ca, symbol, price in rows))
 
 def get_token_price(ca: str) -> Optional[dict]:
     """
     Return the current live price row for the given contract address, or None if not found.
     Shape: {"ca": ..., "symbol": ..., "price": float, "timestamp": int}
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.execute(SQL_SELECT_TOKEN_PRICE, (ca,))
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "ca": row["ca"],
-            "symbol": row["symbol"],
-            "price": float(row["price"]),
-            "timestamp": int(row["timestamp"]),
-        }
+    row = get_conn().execute(SQL_SELECT_TOKEN_PRICE, (ca,)).fetchone()
+    if not row:
+        return None
+    return {
+        "ca": row["ca"],
+        "symbol": row["symbol"],
+        "price": float(row["price"]),
+        "timestamp": int(row["timestamp"]),
+    }
 
 
 # ============================================================
@@ -125,6 +239,17 @@ INSERT INTO ladder_runs (
 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
 """
 
+# SQLite >= 3.35 can hand back the new id from the INSERT itself
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_INSERT_LADDER_RUN_RETURNING = SQL_INSERT_LADDER_RUN.rstrip() + "\nRETURNING id\n"
+
+def _insert_run(conn: sqlite3.Connection, params: Tuple) -> int:
+    """Execute SQL_INSERT_LADDER_RUN and return the new run id."""
+    if _HAS_RETURNING:
+        # fetchall() steps the statement to completion so it is reset right away
+        return int(conn.execute(SQL_INSERT_LADDER_RUN_RETURNING, params).fetchall()[0][0])
+    return int(conn.execute(SQL_INSERT_LADDER_RUN, params).lastrowid)
+
 def create_ladder_run(
     *,
     base_address: str,
@@ -145,21 +270,16 @@ def create_ladder_run(
     Insert a ladder_runs row and return run_id.
     """
     ladder_json = json.dumps(list(usd_ladder)) if usd_ladder is not None else None
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("PRAGMA foreign_keys=ON")
-        cur = conn.execute(
-            SQL_INSERT_LADDER_RUN,
-            (
-                base_address, pair_address, quote_address,
-                base_symbol, quote_symbol, int(base_decimals), int(quote_decimals),
-                int(baseline_usd), float(quote_usd), float(base_usd),
-                str(unit_buy_baseline), str(unit_sell_baseline),
-                ladder_json,
-            ),
-        )
-        run_id = cur.lastrowid
-        conn.commit()
-        return int(run_id)
+    return _insert_run(
+        get_conn(),
+        (
+            base_address, pair_address, quote_address,
+            base_symbol, quote_symbol, int(base_decimals), int(quote_decimals),
+            int(baseline_usd), float(quote_usd), float(base_usd),
+            str(unit_buy_baseline), str(unit_sell_baseline),
+            ladder_json,
+        ),
+    )
 
 
 SQL_INSERT_LADDER_POINT = """
@@ -197,23 +317,39 @@ def insert_ladder_point(
     """
     Insert or update a single ladder point for a run.
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("PRAGMA foreign_keys=ON")
-        conn.execute(
-            SQL_INSERT_LADDER_POINT,
-            (
-                int(run_id), int(usd),
-                float(buy_bps) if buy_bps is not None else None,
-                float(sell_bps) if sell_bps is not None else None,
-                1 if buy_liquidity_available else 0 if buy_liquidity_available is not None else None,
-                1 if sell_liquidity_available else 0 if sell_liquidity_available is not None else None,
-                buy_top_source,
-                float(buy_route_concentration_percent) if buy_route_concentration_percent is not None else None,
-                sell_top_source,
-                float(sell_route_concentration_percent) if sell_route_concentration_percent is not None else None,
-            ),
-        )
-        conn.commit()
+    get_conn().execute(
+        SQL_INSERT_LADDER_POINT,
+        (
+            int(run_id), int(usd),
+            float(buy_bps) if buy_bps is not None else None,
+            float(sell_bps) if sell_bps is not None else None,
+            1 if buy_liquidity_available else 0 if buy_liquidity_available is not None else None,
+            1 if sell_liquidity_available else 0 if sell_liquidity_available is not None else None,
+            buy_top_source,
+            float(buy_route_concentration_percent) if buy_route_concentration_percent is not None else None,
+            sell_top_source,
+            float(sell_route_concentration_percent) if sell_route_concentration_percent is not None else None,
+        ),
+    )
+
+def _point_params(run_id: int, row: Tuple) -> Tuple:
+    """(usd, buy_bps, sell_bps, buy_liq, sell_liq, buy_top, buy_conc, sell_top, sell_conc) -> SQL params."""
+    usd, buy_bps, sell_bps, buy_liq, sell_liq, buy_top, buy_conc, sell_top, sell_conc = row
+    return (
+        run_id, int(usd),
+        float(buy_bps) if buy_bps is not None else None,
+        float(sell_bps) if sell_bps is not None else None,
+        1 if buy_liq else 0 if buy_liq is not None else None,
+        1 if sell_liq else 0 if sell_liq is not None else None,
+        buy_top,
+        float(buy_conc) if buy_conc is not None else None,
+        sell_top,
+        float(sell_conc) if sell_conc is not None else None,
+    )
+
+def _fast_point_params(run_id: int, row: Tuple) -> Tuple:
+    """Trusted variant of _point_params: values are already int/float/bool/None."""
+    return (run_id,) + tuple(row)
 
 def bulk_insert_ladder_points(
     run_id: int,
@@ -221,31 +357,20 @@ def bulk_insert_ladder_points(
         int, Optional[float], Optional[float], Optional[bool], Optional[bool],
         Optional[str], Optional[float], Optional[str], Optional[float]
     ]],
+    *,
+    trusted: bool = False,
 ) -> None:
     """
     Efficiently insert/update many points for a run.
     Each row is: (usd, buy_bps, sell_bps, buy_liq, sell_liq, buy_top, buy_conc, sell_top, sell_conc)
+    trusted=True skips per-value coercion when rows already hold native types
+    (sqlite3 binds bool as 0/1 itself).
     """
-    rows = list(rows)
-    if not rows:
-        return
-    payload = []
-    for (usd, buy_bps, sell_bps, buy_liq, sell_liq, buy_top, buy_conc, sell_top, sell_conc) in rows:
-        payload.append((
-            int(run_id), int(usd),
-            float(buy_bps) if buy_bps is not None else None,
-            float(sell_bps) if sell_bps is not None else None,
-            1 if buy_liq else 0 if buy_liq is not None else None,
-            1 if sell_liq else 0 if sell_liq is not None else None,
-            buy_top,
-            float(buy_conc) if buy_conc is not None else None,
-            sell_top,
-            float(sell_conc) if sell_conc is not None else None,
-        ))
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("PRAGMA foreign_keys=ON")
-        conn.executemany(SQL_INSERT_LADDER_POINT, payload)
-        conn.commit()
+    rid = int(run_id)
+    shape = _fast_point_params if trusted else _point_params
+    with _transaction() as conn:
+        # generator straight into executemany: no intermediate row/payload lists
+        conn.executemany(SQL_INSERT_LADDER_POINT, (shape(rid, r) for r in rows))
 
 
 # ---------------------------
@@ -265,29 +390,26 @@ WHERE id = ?
 """
 
 def get_ladder_run(run_id: int) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.execute(SQL_SELECT_LADDER_RUN, (int(run_id),))
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "id": int(row["id"]),
-            "started_at": int(row["started_at"]),
-            "base_address": row["base_address"],
-            "pair_address": row["pair_address"],
-            "quote_address": row["quote_address"],
-            "base_symbol": row["base_symbol"],
-            "quote_symbol": row["quote_symbol"],
-            "base_decimals": int(row["base_decimals"]),
-            "quote_decimals": int(row["quote_decimals"]),
-            "baseline_usd": int(row["baseline_usd"]),
-            "quote_usd": float(row["quote_usd"]),
-            "base_usd": float(row["base_usd"]),
-            "unit_buy_baseline": row["unit_buy_baseline"],
-            "unit_sell_baseline": row["unit_sell_baseline"],
-            "usd_ladder": json.loads(row["usd_ladder_json"]) if row["usd_ladder_json"] else None,
-        }
+    row = get_conn().execute(SQL_SELECT_LADDER_RUN, (int(run_id),)).fetchone()
+    if not row:
+        return None
+    return {
+        "id": int(row["id"]),
+        "started_at": int(row["started_at"]),
+        "base_address": row["base_address"],
+        "pair_address": row["pair_address"],
+        "quote_address": row["quote_address"],
+        "base_symbol": row["base_symbol"],
+        "quote_symbol": row["quote_symbol"],
+        "base_decimals": int(row["base_decimals"]),
+        "quote_decimals": int(row["quote_decimals"]),
+        "baseline_usd": int(row["baseline_usd"]),
+        "quote_usd": float(row["quote_usd"]),
+        "base_usd": float(row["base_usd"]),
+        "unit_buy_baseline": row["unit_buy_baseline"],
+        "unit_sell_baseline": row["unit_sell_baseline"],
+        "usd_ladder": json.loads(row["usd_ladder_json"]) if row["usd_ladder_json"] else None,
+    }
 
 SQL_LIST_LADDER_RUNS = """
 SELECT
@@ -301,22 +423,22 @@ OFFSET ?
 """
 
 def list_ladder_runs(limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.execute(SQL_LIST_LADDER_RUNS, (int(limit), int(offset)))
-        out = []
-        for r in cur.fetchall():
-            out.append({
-                "id": int(r["id"]),
-                "started_at": int(r["started_at"]),
-                "base_address": r["base_address"],
-                "pair_address": r["pair_address"],
-                "quote_address": r["quote_address"],
-                "base_symbol": r["base_symbol"],
-                "quote_symbol": r["quote_symbol"],
-                "baseline_usd": int(r["baseline_usd"]),
-            })
-        return out
+    cur = _tuple_cursor()
+    cur.execute(SQL_LIST_LADDER_RUNS, (int(limit), int(offset)))
+    return [
+        {
+            "id": int(rid),
+            "started_at": int(started_at),
+            "base_address": base_address,
+            "pair_address": pair_address,
+            "quote_address": quote_address,
+            "base_symbol": base_symbol,
+            "quote_symbol": quote_symbol,
+            "baseline_usd": int(baseline_usd),
+        }
+        for (rid, started_at, base_address, pair_address, quote_address,
+             base_symbol, quote_symbol, baseline_usd) in cur
+    ]
 
 SQL_SELECT_LADDER_POINTS = """
 SELECT
@@ -330,25 +452,51 @@ WHERE run_id = ?
 ORDER BY usd ASC
 """
 
+def get_ladder_points_raw(run_id: int) -> List[Tuple]:
+    """
+    Points for a run as plain tuples in SQL_SELECT_LADDER_POINTS column order
+    (no dict building, no type coercion).
+    """
+    cur = _tuple_cursor()
+    cur.execute(SQL_SELECT_LADDER_POINTS, (int(run_id),))
+    return cur.fetchall()
+
+LADDER_POINT_COLUMNS = (
+    "run_id", "usd",
+    "buy_bps", "sell_bps",
+    "buy_liquidity_available", "sell_liquidity_available",
+    "buy_top_source", "buy_route_concentration_percent",
+    "sell_top_source", "sell_route_concentration_percent",
+)
+
+def get_ladder_points_columns(run_id: int) -> Dict[str, Tuple]:
+    """
+    Columnar view of a run's points: {column: tuple of values}, ordered by usd.
+    Raw SQLite values (liquidity flags stay 0/1/None); feed straight into
+    numpy.asarray(...) for vectorized work.
+    """
+    rows = get_ladder_points_raw(run_id)
+    if not rows:
+        return {name: () for name in LADDER_POINT_COLUMNS}
+    return dict(zip(LADDER_POINT_COLUMNS, zip(*rows)))
+
 def get_ladder_points(run_id: int) -> List[Dict[str, Any]]:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.execute(SQL_SELECT_LADDER_POINTS, (int(run_id),))
-        out = []
-        for r in cur.fetchall():
-            out.append({
-                "run_id": int(r["run_id"]),
-                "usd": int(r["usd"]),
-                "buy_bps": float(r["buy_bps"]) if r["buy_bps"] is not None else None,
-                "sell_bps": float(r["sell_bps"]) if r["sell_bps"] is not None else None,
-                "buy_liquidity_available": bool(r["buy_liquidity_available"]) if r["buy_liquidity_available"] is not None else None,
-                "sell_liquidity_available": bool(r["sell_liquidity_available"]) if r["sell_liquidity_available"] is not None else None,
-                "buy_top_source": r["buy_top_source"],
-                "buy_route_concentration_percent": float(r["buy_route_concentration_percent"]) if r["buy_route_concentration_percent"] is not None else None,
-                "sell_top_source": r["sell_top_source"],
-                "sell_route_concentration_percent": float(r["sell_route_concentration_percent"]) if r["sell_route_concentration_percent"] is not None else None,
-            })
-        return out
+    return [
+        {
+            "run_id": int(rid),
+            "usd": int(usd),
+            "buy_bps": float(buy_bps) if buy_bps is not None else None,
+            "sell_bps": float(sell_bps) if sell_bps is not None else None,
+            "buy_liquidity_available": bool(bliq) if bliq is not None else None,
+            "sell_liquidity_available": bool(sliq) if sliq is not None else None,
+            "buy_top_source": btop,
+            "buy_route_concentration_percent": float(bconc) if bconc is not None else None,
+            "sell_top_source": stop,
+            "sell_route_concentration_percent": float(sconc) if sconc is not None else None,
+        }
+        for (rid, usd, buy_bps, sell_bps, bliq, sliq, btop, bconc, stop, sconc)
+        in get_ladder_points_raw(run_id)
+    ]
 
 
 # ---------------------------
@@ -361,59 +509,81 @@ def delete_ladder_run(run_id: int) -> int:
     """
     Delete a run (points cascade via FK). Returns number of deleted ladder_runs rows (0 or 1).
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("PRAGMA foreign_keys=ON")
-        cur = conn.execute(SQL_DELETE_LADDER_RUN, (int(run_id),))
-        conn.commit()
-        return cur.rowcount
+    cur = get_conn().execute(SQL_DELETE_LADDER_RUN, (int(run_id),))
+    return cur.rowcount
 
 
 # ---------------------------
 # Convenience: save output from ladder.run()
 # ---------------------------
 
-def save_ladder_result(result: Dict[str, Any]) -> int:
-    """
-    Convenience wrapper to persist the dict returned by your ladder `run()` orchestrator.
-    Expects the structure produced by your modular ladder script.
-    Returns the created run_id.
-    """
+def _run_params(result: Dict[str, Any]) -> Tuple:
+    """SQL_INSERT_LADDER_RUN params from a ladder `run()` result dict."""
     pair = result["pair"]
     params = result["params"]
     prices = result["prices"]
     baselines = result.get("baselines", {})
-    rows = result.get("rows", [])
-
-    run_id = create_ladder_run(
-        base_address=pair["base"]["address"],
-        pair_address=pair["pair_address"],
-        quote_address=pair["quote"]["address"],
-        base_symbol=pair["base"]["symbol"],
-        quote_symbol=pair["quote"]["symbol"],
-        base_decimals=int(pair["base"]["decimals"]),
-        quote_decimals=int(pair["quote"]["decimals"]),
-        baseline_usd=int(params["baseline_usd"]),
-        quote_usd=float(prices["quote_usd"]),
-        base_usd=float(prices["base_usd"]),
-        unit_buy_baseline=str(baselines.get("unit_buy_baseline_base_per_quote", "")),
-        unit_sell_baseline=str(baselines.get("unit_sell_baseline_quote_per_base", "")),
-        usd_ladder=params.get("usd_ladder"),
+    ladder = params.get("usd_ladder")
+    return (
+        pair["base"]["address"], pair["pair_address"], pair["quote"]["address"],
+        pair["base"]["symbol"], pair["quote"]["symbol"],
+        int(pair["base"]["decimals"]), int(pair["quote"]["decimals"]),
+        int(params["baseline_usd"]), float(prices["quote_usd"]), float(prices["base_usd"]),
+        str(baselines.get("unit_buy_baseline_base_per_quote", "")),
+        str(baselines.get("unit_sell_baseline_quote_per_base", "")),
+        json.dumps(list(ladder)) if ladder is not None else None,
+    )
+
+def _result_point_params(run_id: int, r: Dict[str, Any]) -> Tuple:
+    """SQL_INSERT_LADDER_POINT params from one `run()` result row dict."""
+    return (
+        run_id, int(r["usd"]),
+        float(r["buy_bps"]) if r["buy_bps"] is not None else None,
+        float(r["sell_bps"]) if r["sell_bps"] is not None else None,
+        1 if r.get("buy_liquidity_available") else 0 if r.get("buy_liquidity_available") is not None else None,
+        1 if r.get("sell_liquidity_available") else 0 if r.get("sell_liquidity_available") is not None else None,
+        r.get("buy_top_source"),
+        float(r["buy_route_concentration_percent"]) if r.get("buy_route_concentration_percent") is not None else None,
+        r.get("sell_top_source"),
+        float(r["sell_route_concentration_percent"]) if r.get("sell_route_concentration_percent") is not None else None,
     )
 
-    # Adapt rows into the bulk insert shape
-    point_rows = []
-    for r in rows:
-        point_rows.append((
-            int(r["usd"]),
-            float(r["buy_bps"]) if r["buy_bps"] is not None else None,
-            float(r["sell_bps"]) if r["sell_bps"] is not None else None,
-            bool(r["buy_liquidity_available"]) if r.get("buy_liquidity_available") is not None else None,
-            bool(r["sell_liquidity_available"]) if r.get("sell_liquidity_available") is not None else None,
-            r.get("buy_top_source"),
-            float(r["buy_route_concentration_percent"]) if r.get("buy_route_concentration_percent") is not None else None,
-            r.get("sell_top_source"),
-            float(r["sell_route_concentration_percent"]) if r.get("sell_route_concentration_percent") is not None else None,
-        ))
-
-    bulk_insert_ladder_points(run_id, point_rows)
+def _fast_result_point_params(run_id: int, r: Dict[str, Any]) -> Tuple:
+    """Trusted variant of _result_point_params: `run()` rows already hold native types."""
+    return (
+        run_id, r["usd"], r["buy_bps"], r["sell_bps"],
+        r.get("buy_liquidity_available"), r.get("sell_liquidity_available"),
+        r.get("buy_top_source"), r.get("buy_route_concentration_percent"),
+        r.get("sell_top_source"), r.get("sell_route_concentration_percent"),
+    )
+
+def _insert_ladder_result(conn: sqlite3.Connection, result: Dict[str, Any], trusted: bool = False) -> int:
+    """Insert one run + its points on conn (caller owns the transaction). Returns run_id."""
+    run_id = _insert_run(conn, _run_params(result))
+    shape = _fast_result_point_params if trusted else _result_point_params
+    conn.executemany(
+        SQL_INSERT_LADDER_POINT,
+        (shape(run_id, r) for r in result.get("rows", [])),
+    )
     return run_id
+
+def save_ladder_result(result: Dict[str, Any], *, trusted: bool = True) -> int:
+    """
+    Convenience wrapper to persist the dict returned by your ladder `run()` orchestrator.
+    Expects the structure produced by your modular ladder script.
+    Run row + points are written in one transaction. Returns the created run_id.
+    trusted=True (default) binds row values as-is; pass False for hand-built rows
+    that may need int/float coercion.
+    """
+    with _transaction() as conn:
+        return _insert_ladder_result(conn, result, trusted)
+
+
+def save_ladder_results_bulk(results: Iterable[Dict[str, Any]], *, trusted: bool = True) -> List[int]:
+    """
+    Persist many ladder `run()` results in a single transaction.
+    Runs are inserted one by one (each needs its own run_id); points go through executemany.
+    Returns the created run_ids in input order.
+    """
+    with _transaction() as conn:
+        return [_insert_ladder_result(conn, result, trusted) for result in results]
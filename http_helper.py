@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# http_helper.py
+#
+# One pooled keep-alive requests.Session profile and one request-header cache
+# shared by the API scripts (quote, token_price, token_data, controller).
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+__all__ = ["RETRY_STATUSES", "api_headers", "pooled_session"]
+
+# Transient statuses retried on the same pooled connection (backoff + Retry-After)
+RETRY_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+def pooled_session(pool_connections: int, pool_maxsize: int, *,
+                   retry_statuses: Tuple[int, ...] = RETRY_STATUSES) -> requests.Session:
+    """
+    Session with an HTTPS connection pool and GET retries on retry_statuses.
+    raise_on_status=False: once retries run out the last response is returned,
+    so callers' own status checks still produce their usual errors.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=retry_statuses,
+                          allowed_methods=frozenset({"GET"}), raise_on_status=False),
+    ))
+    return session
+
+@lru_cache(maxsize=64)
+def api_headers(*items: Tuple[str, str]) -> Dict[str, str]:
+    """
+    JSON request headers plus items (e.g. API key, chain), built once per distinct
+    items and shared: requests merges them into a fresh dict per request and never
+    mutates ours.
+    """
+    return {"accept": "application/json", **dict(items)}
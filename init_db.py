@@ -3,14 +3,26 @@
 init_db.py
 
 Schema: base/quote with base_address as the main identifier.
-If ./config.json has {"db_path": "..."} it's used; otherwise ./liquidity.db.
+DB path: $DLI_DB_PATH if set, else ./config.json {"db_path": "..."}, else ./liquidity.db.
 """
 
-import json
+import os
 import sqlite3
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
+
+from json_helper import json_loads
+
+# Bump whenever SCHEMA_SQL / INDEXES_SQL change so existing DBs re-apply them once;
+# stored in PRAGMA user_version, so an up-to-date DB skips all DDL parsing.
+SCHEMA_VERSION = 1
 
 SCHEMA_SQL = """
+-- Storage layout: only takes effect on a fresh file (before the first table exists)
+PRAGMA page_size = 8192;
+PRAGMA auto_vacuum = INCREMENTAL;
+
 PRAGMA foreign_keys = ON;
 
 -- ============================================================
@@ -43,16 +55,15 @@ CREATE TABLE IF NOT EXISTS token_prices_live (
   ca         TEXT PRIMARY KEY,                                  -- token contract address
   symbol     TEXT,
   price      REAL NOT NULL,                                     -- choose a single unit (e.g., USD)
-  timestamp  INTEGER NOT NULL DEFAULT (strftime('%s','now'))    -- UNIX seconds on INSERT
+  timestamp  INTEGER NOT NULL DEFAULT (strftime('%s','now'))    -- UNIX seconds; DEFAULT on INSERT,
+                                                                -- writers set it on UPDATE (no trigger)
 );
 
-CREATE TRIGGER IF NOT EXISTS trg_token_prices_live_touch
-AFTER UPDATE OF price, symbol ON token_prices_live
-BEGIN
-  UPDATE token_prices_live
-  SET timestamp = strftime('%s','now')
-  WHERE ca = NEW.ca;
-END;
+-- Writer contract: any UPDATE of price/symbol must also set
+--   timestamp = strftime('%s','now')
+-- (db_helper.SQL_UPSERT_TOKEN_PRICE does). SQLite triggers can't modify NEW, so
+-- the old AFTER UPDATE touch trigger cost a second row write; drop it from existing DBs.
+DROP TRIGGER IF EXISTS trg_token_prices_live_touch;
 
 CREATE INDEX IF NOT EXISTS idx_token_prices_live_symbol
   ON token_prices_live(symbol);
@@ -63,7 +74,9 @@ CREATE INDEX IF NOT EXISTS idx_token_prices_live_symbol
 
 -- One row per ladder execution (run). Holds the context/baselines used.
 CREATE TABLE IF NOT EXISTS ladder_runs (
-  id                     INTEGER PRIMARY KEY AUTOINCREMENT,
+  -- rowid alias without AUTOINCREMENT: no sqlite_sequence write per insert. Ids still
+  -- increase; only the id of a deleted newest run can be reused (its points cascade).
+  id                     INTEGER PRIMARY KEY,
   started_at             INTEGER NOT NULL DEFAULT (strftime('%s','now')),
 
   -- Pair context (FK to token_pairs for referential integrity)
@@ -119,28 +132,78 @@ CREATE TABLE IF NOT EXISTS ladder_points (
   FOREIGN KEY (run_id) REFERENCES ladder_runs(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_ladder_points_run
-  ON ladder_points(run_id);
+-- run_id lookups are served by the (run_id, usd) PK; a separate run_id index
+-- only added a second B-tree write per point, so drop it from existing DBs.
+DROP INDEX IF EXISTS idx_ladder_points_run;
+"""
+
+# Indexes for hot read paths (listing/sorting). Kept separate so they can be
+# (re)applied to an existing database without re-running the whole schema.
+# (base_address, pair_address) lookups are already served by the token_pairs PK.
+INDEXES_SQL = """
+-- pairs:list / menu listing: ORDER BY base_symbol, quote_symbol, pair_address
+CREATE INDEX IF NOT EXISTS idx_token_pairs_sort
+  ON token_pairs(base_symbol, quote_symbol, pair_address);
+
+-- runs:list: ORDER BY started_at DESC, id DESC LIMIT/OFFSET served index-only
+CREATE INDEX IF NOT EXISTS idx_ladder_runs_list
+  ON ladder_runs(started_at DESC, id DESC, base_address, pair_address, quote_address,
+                 base_symbol, quote_symbol, baseline_usd);
+
+-- per-pair run history (newest first); ladder_points(run_id, usd) is already the PK
+CREATE INDEX IF NOT EXISTS idx_ladder_runs_base_pair
+  ON ladder_runs(base_address, pair_address, started_at DESC);
+
+-- plot_menu run history: WHERE lower(pair_address) = lower(?)
+--   ORDER BY started_at DESC, id DESC LIMIT ?  -> index-only, no sort, no row lookups
+CREATE INDEX IF NOT EXISTS idx_ladder_runs_pair_recent
+  ON ladder_runs(lower(pair_address), started_at DESC, id DESC, base_usd);
 """
 
+@lru_cache(maxsize=1)
+def _read_cfg(cfg_path: Path, mtime_ns: int) -> Any:
+    """Parsed config.json, memoized on (path, mtime)."""
+    return json_loads(cfg_path.read_bytes())
+
 def get_db_path() -> Path:
+    env_path = os.environ.get("DLI_DB_PATH")
+    if env_path:
+        return Path(env_path)
     cfg_path = Path("config.json")
-    if cfg_path.exists():
-        try:
-            cfg = json.loads(cfg_path.read_text(encoding="utf-8"))
-            if isinstance(cfg, dict) and cfg.get("db_path"):
-                return Path(cfg["db_path"])
-        except Exception:
-            pass
+    try:
+        cfg = _read_cfg(cfg_path, cfg_path.stat().st_mtime_ns)
+        if isinstance(cfg, dict) and cfg.get("db_path"):
+            return Path(cfg["db_path"])
+    except Exception:
+        pass
     return Path("liquidity.db")
 
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Idempotently create the hot-path indexes (skipped once the DB is at SCHEMA_VERSION)."""
+    if schema_version(conn) < SCHEMA_VERSION:
+        conn.executescript(INDEXES_SQL)
+
 def init_db(db_path: Path) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     with sqlite3.connect(db_path) as conn:
+        if schema_version(conn) >= SCHEMA_VERSION:
+            print(f"[ok] schema up to date (v{SCHEMA_VERSION}) at: {db_path}")
+            return
         # Ensure foreign keys are on for this connection too
         conn.execute("PRAGMA foreign_keys = ON;")
         conn.executescript(SCHEMA_SQL)
+        ensure_indexes(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # WAL is persistent in the file; NORMAL is durable enough under WAL and
+        # avoids the second fsync per commit of the default rollback journal.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         conn.commit()
+        # refresh planner statistics for the (new) indexes
+        conn.execute("PRAGMA optimize")
     print(f"[ok] initialized schema at: {db_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# json_helper.py
+#
+# One optional-orjson JSON codec shared by every module (config reads, API
+# response bodies, pretty-printed output). Stdlib-only besides orjson, so
+# db_helper / init_db / plot_menu can use it without importing requests.
+
+import json
+from typing import Any
+
+__all__ = ["json_loads", "json_dumps"]
+
+try:  # optional fast JSON codec (parses raw bytes directly)
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any, *, indent: bool = False) -> str:
+        """obj as a JSON str: compact, or 2-space indented with indent=True."""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any, *, indent: bool = False) -> str:
+        """obj as a JSON str: compact, or 2-space indented with indent=True."""
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
@@ -3,7 +3,7 @@
 #
 # Test sweep: fixed USD ladder, both directions, compute impact (bps) vs baseline.
 # Reuses your existing code:
-#  - quote.get_price, quote.to_base_units, quote.parse_0x_price_response (0x v2, slippageBps=0)
+#  - quote.get_price, quote.usd_to_base_units, quote.parse_0x_price_response (0x v2, slippageBps=0)
 #  - db_helper.get_token_price / upsert_token_price (for live WETH USD)
 #  - token_price.fetch_token_overview / extract_symbol_price (Birdeye WETH USD fallback)
 #
@@ -14,20 +14,28 @@
 # Output: console table with USD, BUY_bps, SELL_bps, and quick notes.
 # Side-effect when run as __main__: persists results to DB via db_helper.save_ladder_result()
 
+import copy
 import json
 import sqlite3
+import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from decimal import Decimal, getcontext
 
 # --- precision for on-chain unit math ---
-getcontext().prec = 80
+# 40 significant digits covers wei amounts (<= ~30 digits) and the baseline
+# ratios; mpdecimal cost grows with prec, and bps math is done in float anyway.
+# Decimal contexts are per-thread, so run() and each worker set it on entry.
+DECIMAL_PREC = 40
 
 # --- local modules (existing code) ---
-from quote import get_price, to_base_units, parse_0x_price_response  # noqa
+from json_helper import json_loads
+from quote import get_price, usd_to_base_units, parse_0x_price_response
 from db_helper import (
-    DB_PATH,
+    get_conn,
     get_token_price,
     upsert_token_price,
     save_ladder_result,   # NEW: save result dict to DB
@@ -55,11 +63,18 @@ WETH_CA = "0x4200000000000000000000000000000000000006"
 
 # ----------------------------- Utility ---------------------------------
 
+# quantizers for fmt_decimal, built once instead of parsed from a string per call
+_Q = {p: Decimal("1." + "0" * p) for p in (6, 8, 12)}
+
+
 def fmt_decimal(n: Optional[Decimal], places: int = 8) -> str:
-    """Nicely format Decimals (or None)."""
+    """Nicely format Decimals / floats (or None)."""
     if n is None:
         return "-"
-    q = Decimal("1." + "0" * places)
+    if isinstance(n, float) or places <= 4:
+        # few places (bps): float formatting is exact enough and much cheaper
+        return f"{float(n):.{places}f}".rstrip("0").rstrip(".")
+    q = _Q.get(places) or Decimal("1." + "0" * places)
     return format(n.quantize(q), "f").rstrip("0").rstrip(".")
 
 
@@ -70,51 +85,75 @@ def impact_bps(unit_baseline: Decimal, unit_at_size: Decimal) -> Optional[Decima
     return (unit_baseline / unit_at_size - Decimal(1)) * Decimal(10_000)
 
 
+def impact_bps_f(unit_baseline: float, unit_at_size: float) -> Optional[float]:
+    """impact_bps in float64: plenty for bps reported to 2 places, ~100x cheaper than Decimal."""
+    if unit_baseline <= 0 or unit_at_size <= 0:
+        return None
+    return (unit_baseline / unit_at_size - 1.0) * 10_000.0
+
+
 def ratelimit_sleep(seconds: float) -> None:
     time.sleep(seconds)
 
 
 # ------------------------- Config & Pair Select --------------------------
 
-def load_cfg(path: Path = CONFIG_FILE) -> Dict[str, Any]:
-    """Load config.json."""
-    return json.loads(path.read_text(encoding="utf-8"))
+# ((path, mtime_ns), parsed config) of the last load_cfg() call
+_CFG_CACHE: Optional[Tuple[Tuple[str, int], Dict[str, Any]]] = None
 
 
-def pick_pair(conn: sqlite3.Connection, cfg: Dict[str, Any]) -> Optional[sqlite3.Row]:
+def load_cfg(path: Path = CONFIG_FILE) -> Dict[str, Any]:
+    """Load config.json (parse memoized on path + mtime; callers get a private deep copy)."""
+    global _CFG_CACHE
+    key = (str(path), path.stat().st_mtime_ns)
+    if _CFG_CACHE is None or _CFG_CACHE[0] != key:
+        _CFG_CACHE = (key, json_loads(path.read_bytes()))
+    return copy.deepcopy(_CFG_CACHE[1])
+
+
+def invalidate_cfg_cache() -> None:
+    """Force the next load_cfg() to re-read config.json."""
+    global _CFG_CACHE
+    _CFG_CACHE = None
+
+
+SQL_PICK_PAIR_IN = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address,
+       quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+WHERE pair_address IN (SELECT value FROM json_each(?))
+ORDER BY base_address
+LIMIT 1
+"""
+
+SQL_PICK_FIRST_PAIR = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address,
+       quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+ORDER BY rowid
+LIMIT 1
+"""
+
+def pick_pair(conn: sqlite3.Connection, cfg: Dict[str, Any], pair_address: Optional[str] = None) -> Optional[sqlite3.Row]:
     """
-    Pick a pair from token_pairs. If cfg['pair_addresses'] present, prefer those.
+    Pick a pair from token_pairs. If pair_address is given, only that pair is considered;
+    otherwise, if cfg['pair_addresses'] present, prefer those.
     Returns sqlite3.Row with:
       base_address, base_symbol, base_decimals,
       pair_address,
       quote_address, quote_symbol, quote_decimals
     """
-    conn.row_factory = sqlite3.Row
-    wanted = (cfg.get("pair_addresses") or [])
+    # Row factory on the cursor only: conn may be the shared db_helper connection
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    wanted = [pair_address] if pair_address else (cfg.get("pair_addresses") or [])
     if wanted:
-        cur = conn.execute(
-            f"""
-            SELECT base_address, base_symbol, base_decimals,
-                   pair_address,
-                   quote_address, quote_symbol, quote_decimals
-            FROM token_pairs
-            WHERE pair_address IN ({",".join("?" * len(wanted))})
-            ORDER BY base_address
-            LIMIT 1
-            """,
-            wanted,
-        )
+        # one JSON-array parameter -> same statement text for any list length
+        cur.execute(SQL_PICK_PAIR_IN, (json.dumps(wanted),))
     else:
-        cur = conn.execute(
-            """
-            SELECT base_address, base_symbol, base_decimals,
-                   pair_address,
-                   quote_address, quote_symbol, quote_decimals
-            FROM token_pairs
-            ORDER BY rowid
-            LIMIT 1
-            """
-        )
+        cur.execute(SQL_PICK_FIRST_PAIR)
     return cur.fetchone()
 
 
@@ -153,6 +192,8 @@ def compute_baselines(
     quote_dec: int,
     quote_usd: Decimal,
     baseline_usd: Decimal,
+    *,
+    memo: Optional[Dict[Tuple[str, str, str], Dict[str, Any]]] = None,
 ) -> Tuple[Decimal, Decimal, Decimal, Decimal, Decimal]:
     """
     Returns:
@@ -161,10 +202,11 @@ def compute_baselines(
       unit_sell_baseline               (Decimal)   QUOTE per 1 BASE
       buy_baseline_usd_per_base        (Decimal)   USD per 1 BASE using BUY baseline quote
       sell_baseline_usd_per_base       (Decimal)   USD per 1 BASE using SELL baseline quote
+    If memo is given, the parsed baseline quotes are stored in it keyed by
+    (sell_token, buy_token, sell_units) so ladder_sweep can reuse them.
     """
     # BUY baseline: QUOTE -> BASE at $baseline_usd (derive BASE_USD)
-    baseline_quote_sell_hr = baseline_usd / quote_usd
-    baseline_quote_sell_units = to_base_units(str(baseline_quote_sell_hr), quote_dec)
+    baseline_quote_sell_units = usd_to_base_units(baseline_usd, quote_usd, quote_dec)
     resp_buy = get_price(
         sell_token=quote_addr,
         buy_token=base_addr,
@@ -172,14 +214,15 @@ def compute_baselines(
         api_key=api_key,
     )
     parsed_buy = parse_0x_price_response(resp_buy, sell_decimals=quote_dec, buy_decimals=base_dec)
+    if memo is not None:
+        memo[(quote_addr, base_addr, baseline_quote_sell_units)] = parsed_buy
     unit_buy_baseline = Decimal(parsed_buy["unit_price_human"])  # BASE per 1 QUOTE
 
     # BASE_USD inferred from BUY baseline
     base_usd = quote_usd / unit_buy_baseline if unit_buy_baseline > 0 else Decimal(0)
 
     # SELL baseline: BASE -> QUOTE at $baseline_usd (anchor for SELL impact)
-    baseline_base_sell_hr = baseline_usd / (base_usd if base_usd > 0 else Decimal("1"))
-    baseline_base_sell_units = to_base_units(str(baseline_base_sell_hr), base_dec)
+    baseline_base_sell_units = usd_to_base_units(baseline_usd, base_usd if base_usd > 0 else Decimal("1"), base_dec)
     resp_sell = get_price(
         sell_token=base_addr,
         buy_token=quote_addr,
@@ -187,6 +230,8 @@ def compute_baselines(
         api_key=api_key,
     )
     parsed_sell = parse_0x_price_response(resp_sell, sell_decimals=base_dec, buy_decimals=quote_dec)
+    if memo is not None:
+        memo[(base_addr, quote_addr, baseline_base_sell_units)] = parsed_sell
     unit_sell_baseline = Decimal(parsed_sell["unit_price_human"])  # QUOTE per 1 BASE
 
     # Common-unit baselines (USD per 1 BASE)
@@ -204,6 +249,16 @@ def compute_baselines(
 
 # ----------------------------- Ladder Sweep ------------------------------
 
+SWEEP_MAX_WORKERS = 8  # concurrent 0x quotes per sweep (rate still capped in quote.get_price)
+
+
+def _quote_leg(api_key: str, sell_token: str, buy_token: str, sell_units: str, sell_dec: int, buy_dec: int) -> Dict[str, Any]:
+    """One 0x price quote, parsed. Runs on a worker thread."""
+    getcontext().prec = DECIMAL_PREC  # Decimal context is per-thread
+    resp = get_price(sell_token=sell_token, buy_token=buy_token, sell_amount=sell_units, api_key=api_key)
+    return parse_0x_price_response(resp, sell_decimals=sell_dec, buy_decimals=buy_dec)
+
+
 def ladder_sweep(
     api_key: str,
     base_addr: str,
@@ -219,54 +274,65 @@ def ladder_sweep(
     *,
     buy_baseline_usd_per_base: Optional[Decimal] = None,  # kept for signature compatibility; unused
     sell_baseline_usd_per_base: Optional[Decimal] = None, # kept for signature compatibility; unused
-) -> List[Tuple[int, Optional[Decimal], Optional[Decimal], bool, bool, Optional[str], float, Optional[str], float]]:
+    memo: Optional[Dict[Tuple[str, str, str], Dict[str, Any]]] = None,
+) -> List[Tuple[int, Optional[float], Optional[float], bool, bool, Optional[str], float, Optional[str], float]]:
     """
     Returns rows:
       (usd, buy_bps, sell_bps, buy_liq, sell_liq, buy_top_source, buy_conc_pct, sell_top_source, sell_conc_pct)
+    buy_bps / sell_bps are floats (None when either price is missing/zero).
+    All 2*N quotes are issued concurrently; quote.get_price enforces the 0x rate
+    limit process-wide, so rps_sleep_sec is no longer slept here (kept for callers/records).
+    Legs already in memo (the baseline quotes from compute_baselines) are not re-fetched.
     """
-    rows = []
+    # Sell amounts are computed up front with the same exact helper as ladder_test.py
+    getcontext().prec = DECIMAL_PREC
+    sell_base_px = base_usd if base_usd > 0 else Decimal("1")
+    legs = []
     for usd in usd_ladder:
-        usd_d = Decimal(usd)
-
-        # BUY: QUOTE -> BASE at this USD (match original ladder_test.py math)
-        sell_quote_hr = usd_d / quote_usd if quote_usd > 0 else Decimal(0)
-        sell_quote_units = to_base_units(str(sell_quote_hr), quote_dec)
-        buy_resp = get_price(
-            sell_token=quote_addr,
-            buy_token=base_addr,
-            sell_amount=sell_quote_units,
-            api_key=api_key,
-        )
-        buy_parsed = parse_0x_price_response(buy_resp, sell_decimals=quote_dec, buy_decimals=base_dec)
-        unit_buy = Decimal(buy_parsed["unit_price_human"]) if buy_parsed["unit_price_human"] != "0" else Decimal(0)
-        buy_bps = impact_bps(unit_buy_baseline, unit_buy)
-        ratelimit_sleep(rps_sleep_sec)
-
-        # SELL: BASE -> QUOTE at this USD (match original ladder_test.py math)
-        sell_base_hr = usd_d / (base_usd if base_usd > 0 else Decimal("1"))
-        sell_base_units = to_base_units(str(sell_base_hr), base_dec)
-        sell_resp = get_price(
-            sell_token=base_addr,
-            buy_token=quote_addr,
-            sell_amount=sell_base_units,
-            api_key=api_key,
-        )
-        sell_parsed = parse_0x_price_response(sell_resp, sell_decimals=base_dec, buy_decimals=quote_dec)
-        unit_sell = Decimal(sell_parsed["unit_price_human"]) if sell_parsed["unit_price_human"] != "0" else Decimal(0)
-        sell_bps = impact_bps(unit_sell_baseline, unit_sell)
-
-        rows.append((
-            usd,
-            buy_bps if buy_bps is not None else None,
-            sell_bps if sell_bps is not None else None,
-            buy_parsed.get("liquidity_available"),
-            sell_parsed.get("liquidity_available"),
-            buy_parsed.get("top_source"),
-            float(buy_parsed.get("route_concentration_percent") or 0.0),
-            sell_parsed.get("top_source"),
-            float(sell_parsed.get("route_concentration_percent") or 0.0),
+        # BUY: QUOTE -> BASE at this USD
+        buy_units = usd_to_base_units(usd, quote_usd, quote_dec) if quote_usd > 0 else "0"
+        # SELL: BASE -> QUOTE at this USD
+        sell_units = usd_to_base_units(usd, sell_base_px, base_dec)
+        legs.append((
+            (quote_addr, base_addr, buy_units, quote_dec, base_dec),
+            (base_addr, quote_addr, sell_units, base_dec, quote_dec),
         ))
 
+    memo = memo or {}
+    ex = ThreadPoolExecutor(max_workers=SWEEP_MAX_WORKERS)
+
+    def submit(leg: Tuple[str, str, str, int, int]) -> Future:
+        hit = memo.get(leg[:3])
+        if hit is None:
+            return ex.submit(_quote_leg, api_key, *leg)
+        done: Future = Future()
+        done.set_result(hit)
+        return done
+
+    try:
+        futures = [(submit(buy_leg), submit(sell_leg)) for buy_leg, sell_leg in legs]
+        # bps only needs float precision; baselines are converted once per sweep
+        buy_base_f = float(unit_buy_baseline)
+        sell_base_f = float(unit_sell_baseline)
+        rows = []
+        for usd, (buy_fut, sell_fut) in zip(usd_ladder, futures):
+            buy_parsed = buy_fut.result()
+            sell_parsed = sell_fut.result()
+            rows.append((
+                usd,
+                impact_bps_f(buy_base_f, float(buy_parsed["unit_price_human"])),
+                impact_bps_f(sell_base_f, float(sell_parsed["unit_price_human"])),
+                buy_parsed.get("liquidity_available"),
+                sell_parsed.get("liquidity_available"),
+                buy_parsed.get("top_source"),
+                float(buy_parsed.get("route_concentration_percent") or 0.0),
+                sell_parsed.get("top_source"),
+                float(sell_parsed.get("route_concentration_percent") or 0.0),
+            ))
+    finally:
+        # on error don't wait for quotes nobody will read
+        ex.shutdown(wait=True, cancel_futures=True)
+
     return rows
 
 
@@ -291,18 +357,29 @@ def render_header(
     print(f"BASE_USD  ({base_sym}): {fmt_decimal(base_usd, 12)}")
 
 
-def render_rows(rows: List[Tuple[int, Optional[Decimal], Optional[Decimal], bool, bool, Optional[str], float, Optional[str], float]]) -> None:
-    print("\nUSD        BUY_bps   SELL_bps   buyLiq  sellLiq   buyTop(%)         sellTop(%)")
-    print("--------------------------------------------------------------------------------")
-    for (usd, b_bps, s_bps, b_liq, s_liq, b_top, b_conc, s_top, s_conc) in rows:
-        print(
-            f"{usd:>7}  "
-            f"{fmt_decimal(b_bps, 2):>8}  "
-            f"{fmt_decimal(s_bps, 2):>8}   "
-            f"{str(b_liq)[0]:>5}    {str(s_liq)[0]:>6}   "
-            f"{(b_top or '-')[:12]:<12}({b_conc:>5.1f})   "
-            f"{(s_top or '-')[:12]:<12}({s_conc:>5.1f})"
-        )
+ROWS_HEADER = (
+    "\nUSD        BUY_bps   SELL_bps   buyLiq  sellLiq   buyTop(%)         sellTop(%)\n"
+    "--------------------------------------------------------------------------------"
+)
+
+
+def _fmt_row(usd: int, b_bps: Optional[float], s_bps: Optional[float], b_liq: bool, s_liq: bool,
+             b_top: Optional[str], b_conc: float, s_top: Optional[str], s_conc: float) -> str:
+    return (
+        f"{usd:>7}  "
+        f"{fmt_decimal(b_bps, 2):>8}  "
+        f"{fmt_decimal(s_bps, 2):>8}   "
+        f"{str(b_liq)[0]:>5}    {str(s_liq)[0]:>6}   "
+        f"{(b_top or '-')[:12]:<12}({b_conc:>5.1f})   "
+        f"{(s_top or '-')[:12]:<12}({s_conc:>5.1f})"
+    )
+
+
+def render_rows(rows: List[Tuple[int, Optional[float], Optional[float], bool, bool, Optional[str], float, Optional[str], float]]) -> None:
+    """Write the ladder table (header + rows) with a single stdout write."""
+    lines = [ROWS_HEADER]
+    lines.extend(_fmt_row(*r) for r in rows)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def render_footer(baseline_usd: Decimal, base_sym: str, quote_sym: str) -> None:
@@ -310,21 +387,35 @@ def render_footer(baseline_usd: Decimal, base_sym: str, quote_sym: str) -> None:
     print(f"- BUY = {quote_sym}→{base_sym} (route-only impact; fees separate)")
     print(f"- SELL = {base_sym}→{quote_sym}")
     print(f"- Impact bps is vs ${int(baseline_usd)} baseline (positive = worse price at size).")
-    print("- You can raise RPS by reducing sleep, but stay under 10 rps.")
+    print("- Quotes run concurrently, capped at quote.ZEROX_MAX_RPS (keep it under 10 rps).")
 
 
 # ------------------------------ Orchestrator ------------------------------
 
+# Serializes table output when run() is called from several threads at once.
+_PRINT_LOCK = threading.Lock()
+
 def run(
     usd_ladder: Optional[List[int]] = None,
     baseline_usd: int = DEFAULT_BASELINE_USD,
     rps_sleep_sec: float = DEFAULT_RPS_SLEEP_SEC,
+    pair_address: Optional[str] = None,
+    cache_prices: bool = True,
+    conn: Optional[sqlite3.Connection] = None,
 ) -> Dict[str, Any]:
     """
     Orchestrates the test and prints the same table as before.
+    If pair_address is given it is used instead of cfg['pair_addresses'].
+    cache_prices=False skips the BASE_USD upsert so a batch caller can write
+    all prices at once (db_helper.bulk_upsert_token_prices).
+    conn defaults to db_helper.get_conn(), the same per-thread connection the
+    price cache and save_ladder_result() use, so a run opens no extra connection.
     Returns a dict with context & rows so other scripts can reuse programmatically.
     (No DB writes here—saving is done in __main__ to keep this reusable/pure.)
     """
+    # Decimal contexts are per-thread; worker threads start from the default (prec=28)
+    getcontext().prec = DECIMAL_PREC
+
     # --- config ---
     cfg = load_cfg()  # expects: 0x_api_key, birdeye_api_key, db_path, chain_id, pair_addresses
     api_key = cfg.get("0x_api_key")
@@ -332,8 +423,9 @@ def run(
         raise SystemExit("Missing 0x_api_key in config.json")
 
     # --- DB / pair ---
-    conn = sqlite3.connect(DB_PATH)
-    pair = pick_pair(conn, cfg)
+    if conn is None:
+        conn = get_conn()
+    pair = pick_pair(conn, cfg, pair_address=pair_address)
     if not pair:
         raise SystemExit("No pair found in token_pairs. Run token_data.py first.")
 
@@ -352,6 +444,7 @@ def run(
 
     # --- baselines ---
     baseline_d = Decimal(baseline_usd)  # int -> Decimal is safe
+    quotes_memo: Dict[Tuple[str, str, str], Dict[str, Any]] = {}  # baseline rung is reused by the sweep
     (
         base_usd,
         unit_buy_baseline,
@@ -366,12 +459,14 @@ def run(
         quote_dec=quote_dec,
         quote_usd=quote_usd,
         baseline_usd=baseline_d,
+        memo=quotes_memo,
     )
 
-    try:
-        upsert_token_price(ca=base_addr, symbol=(base_sym or "BASE"), price=float(base_usd))
-    except Exception as e:
-        print(f"[warn] failed to cache BASE_USD: {e}")
+    if cache_prices:
+        try:
+            upsert_token_price(ca=base_addr, symbol=(base_sym or "BASE"), price=float(base_usd))
+        except Exception as e:
+            print(f"[warn] failed to cache BASE_USD: {e}")
 
     # --- sweep ---
     ladder = usd_ladder or DEFAULT_USD_LADDER
@@ -389,22 +484,24 @@ def run(
         rps_sleep_sec=rps_sleep_sec,
         buy_baseline_usd_per_base=buy_base_usd,
         sell_baseline_usd_per_base=sell_base_usd,
+        memo=quotes_memo,
     )
 
     # --- print (same UX as original) ---
-    render_header(
-        pair_addr=pair_addr,
-        base_sym=base_sym,
-        base_addr=base_addr,
-        quote_sym=quote_sym,
-        quote_addr=quote_addr,
-        usd_ladder=ladder,
-        baseline_usd=baseline_d,
-        quote_usd=quote_usd,
-        base_usd=base_usd,
-    )
-    render_rows(rows)
-    render_footer(baseline_d, base_sym, quote_sym)
+    with _PRINT_LOCK:
+        render_header(
+            pair_addr=pair_addr,
+            base_sym=base_sym,
+            base_addr=base_addr,
+            quote_sym=quote_sym,
+            quote_addr=quote_addr,
+            usd_ladder=ladder,
+            baseline_usd=baseline_d,
+            quote_usd=quote_usd,
+            base_usd=base_usd,
+        )
+        render_rows(rows)
+        render_footer(baseline_d, base_sym, quote_sym)
 
     # Return data for programmatic use
     return {
@@ -428,17 +525,19 @@ def run(
             "buy_baseline_usd_per_base": float(buy_base_usd),
             "sell_baseline_usd_per_base": float(sell_base_usd),
         },
+        # ladder_sweep's tuples already hold float/None bps and float concentrations;
+        # they are shaped into the public row dicts once here, coercing only liquidity
         "rows": [
             {
                 "usd": usd,
-                "buy_bps": float(b_bps) if b_bps is not None else None,
-                "sell_bps": float(s_bps) if s_bps is not None else None,
+                "buy_bps": b_bps,
+                "sell_bps": s_bps,
                 "buy_liquidity_available": bool(b_liq),
                 "sell_liquidity_available": bool(s_liq),
                 "buy_top_source": b_top,
-                "buy_route_concentration_percent": float(b_conc),
+                "buy_route_concentration_percent": b_conc,
                 "sell_top_source": s_top,
-                "sell_route_concentration_percent": float(s_conc),
+                "sell_route_concentration_percent": s_conc,
             }
             for (usd, b_bps, s_bps, b_liq, s_liq, b_top, b_conc, s_top, s_conc) in rows
         ],
@@ -3,7 +3,7 @@
 #
 # Test sweep: fixed USD ladder, both directions, compute impact (bps) vs baseline.
 # Reuses your existing code:
-#  - quote.get_price, quote.to_base_units, quote.parse_0x_price_response (0x v2, slippageBps=0)
+#  - quote.get_price, quote.parse_0x_price_response (0x v2, slippageBps=0)
 #  - db_helper.get_token_price / upsert_token_price (for live WETH USD)
 #  - token_price.fetch_token_overview / extract_symbol_price (Birdeye WETH USD fallback)
 #
@@ -16,17 +16,19 @@
 import json
 import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from decimal import Decimal, getcontext
 
-# --- precision for on-chain unit math ---
-getcontext().prec = 80
+# Decimal only carries prices; sell sizes are exact integer math on the price's
+# integer ratio (quote.usd_to_base_units), and impact bps are computed in float.
+getcontext().prec = 80  # price ratios (BASE_USD, baselines) on the main thread
 
 # --- local modules (existing code) ---
-from quote import get_price, to_base_units, parse_0x_price_response  # 0x helpers (Base chainId=8453)  # noqa
-from db_helper import DB_PATH, get_token_price, upsert_token_price                                           # noqa
-from token_price import load_cfg as _load_cfg, chain_from_id as _chain_from_id, fetch_token_overview, extract_symbol_price  # noqa
+from quote import get_price, usd_to_base_units, parse_0x_price_response  # 0x helpers (Base chainId=8453)  # noqa
+from db_helper import get_conn, get_token_price, upsert_token_price  # noqa
+from token_price import chain_from_id as _chain_from_id, fetch_token_overview, extract_symbol_price  # noqa
 
 CONFIG_FILE = Path("config.json")
 
@@ -34,46 +36,59 @@ CONFIG_FILE = Path("config.json")
 USD_LADDER = [1, 5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000]
 BASELINE_USD = 5  # baseline for impact bps (vs this size)
 
-# Rate-limit: 10 rps -> ~0.1s; use small safety margin.
-RPS_SLEEP_SEC = 0.15
+# Rate-limit: 0x allows 10 rps; quote.get_price paces every call process-wide
+# (quote.ZEROX_MAX_RPS), so ladder quotes are issued concurrently.
+MAX_WORKERS = 8
 
 def _load_cfg() -> Dict[str, Any]:
     cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
     return cfg
 
+# Module-level statements: the address list is one JSON parameter, so the SQL text
+# (and sqlite3's cached prepared statement) is the same for any list length.
+_SQL_PICK_WANTED = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address,
+       quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+WHERE pair_address IN (SELECT value FROM json_each(?))
+ORDER BY base_address LIMIT 1
+"""
+
+_SQL_PICK_ANY = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address,
+       quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+ORDER BY rowid LIMIT 1
+"""
+
 def _pick_pair(conn: sqlite3.Connection, cfg: Dict[str, Any]) -> Optional[sqlite3.Row]:
-    conn.row_factory = sqlite3.Row
-    cur = None
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
     wanted = (cfg.get("pair_addresses") or [])
-    print(wanted)
     if wanted:
-        cur = conn.execute(
-            """
-            SELECT base_address, base_symbol, base_decimals,
-                   pair_address,
-                   quote_address, quote_symbol, quote_decimals
-            FROM token_pairs
-            WHERE pair_address IN ({})
-            ORDER BY base_address LIMIT 1
-            """.format(",".join("?" * len(wanted))),
-            wanted,
-        )
+        cur.execute(_SQL_PICK_WANTED, (json.dumps(wanted),))
     else:
-        cur = conn.execute(
-            """
-            SELECT base_address, base_symbol, base_decimals,
-                   pair_address,
-                   quote_address, quote_symbol, quote_decimals
-            FROM token_pairs
-            ORDER BY rowid LIMIT 1
-            """
-        )
+        cur.execute(_SQL_PICK_ANY)
     return cur.fetchone()
 
+# ca -> (monotonic ts, USD price); lru_cache has no TTL, so keep a small dict
+CACHE_TTL_SEC = 60.0
+_PRICE_CACHE: Dict[str, Tuple[float, float]] = {}
+
 def _get_weth_usd(cfg: Dict[str, Any], weth_ca: str) -> float:
     """
-    Try DB first; fallback to Birdeye token_overview; upsert to DB.
+    Per-process cache (CACHE_TTL_SEC) first, then DB; fallback to Birdeye token_overview; upsert to DB.
     """
+    hit = _PRICE_CACHE.get(weth_ca)
+    if hit is not None and time.monotonic() - hit[0] < CACHE_TTL_SEC:
+        return hit[1]
+    price = _fetch_usd(cfg, weth_ca)
+    _PRICE_CACHE[weth_ca] = (time.monotonic(), price)
+    return price
+
+def _fetch_usd(cfg: Dict[str, Any], weth_ca: str) -> float:
     row = get_token_price(weth_ca)
     if row and row.get("price") not in (None, 0):
         return float(row["price"])
@@ -90,17 +105,21 @@ def _get_weth_usd(cfg: Dict[str, Any], weth_ca: str) -> float:
 def _fmt(n: Optional[Decimal], places: int = 8) -> str:
     if n is None:
         return "-"
+    if isinstance(n, float):
+        return f"{n:.{places}f}".rstrip("0").rstrip(".")
     q = Decimal("1." + "0" * places)
     return format(n.quantize(q), "f").rstrip("0").rstrip(".")
 
-def _impact_bps(unit_baseline: Decimal, unit_at_size: Decimal) -> Optional[Decimal]:
+def _impact_bps(unit_baseline: float, unit_at_size: float) -> Optional[float]:
     if unit_baseline <= 0 or unit_at_size <= 0:
         return None
     # Positive when price gets worse at larger size
-    return (unit_baseline / unit_at_size - Decimal(1)) * Decimal(10_000)
+    return (unit_baseline / unit_at_size - 1.0) * 10_000.0
 
-def _sleep():
-    time.sleep(RPS_SLEEP_SEC)
+def _quote(api_key: str, sell_token: str, buy_token: str, sell_units: str, sell_dec: int, buy_dec: int) -> Dict[str, Any]:
+    """One 0x price quote, parsed. Runs on a worker thread."""
+    resp = get_price(sell_token=sell_token, buy_token=buy_token, sell_amount=sell_units, api_key=api_key)
+    return parse_0x_price_response(resp, sell_decimals=sell_dec, buy_decimals=buy_dec)
 
 def run() -> None:
     # --- config ---
@@ -110,7 +129,7 @@ def run() -> None:
         raise SystemExit("Missing 0x_api_key in config.json")
 
     # --- DB / pair ---
-    conn = sqlite3.connect(DB_PATH)  # DB_PATH from db_helper  :contentReference[oaicite:6]{index=6}
+    conn = get_conn()  # db_helper's pooled connection (WAL, shared with the price cache)
     pair = _pick_pair(conn, cfg)
     if not pair:
         raise SystemExit("No pair found in token_pairs. Run token_data.py first.")
@@ -130,75 +149,63 @@ def run() -> None:
     # USD per 1 QUOTE token (e.g., WETH)
     QUOTE_USD = Decimal(str(quote_usd))
 
-    # --- get baseline BUY (QUOTE->BASE) at BASELINE_USD to infer token USD ---
-    baseline_quote_sell_hr = Decimal(Baseline := BASELINE_USD) / QUOTE_USD
-    # 0x expects base units
-    baseline_quote_sell_base_units = to_base_units(str(baseline_quote_sell_hr), quote_dec)
-    resp_buy_baseline = get_price(
-        sell_token=quote_addr,
-        buy_token=base_addr,
-        sell_amount=baseline_quote_sell_base_units,
-        api_key=api_key,
-    )
-    parsed_buy_baseline = parse_0x_price_response(resp_buy_baseline, sell_decimals=quote_dec, buy_decimals=base_dec)  # :contentReference[oaicite:7]{index=7}
-    # unit price: BASE per 1 QUOTE
-    unit_buy_baseline = Decimal(parsed_buy_baseline["unit_price_human"])
-    # token USD = QUOTE_USD / (BASE per QUOTE)
-    BASE_USD = QUOTE_USD / unit_buy_baseline if unit_buy_baseline > 0 else Decimal(0)
-
-    # --- also get baseline SELL (BASE->QUOTE) for SELL impact baseline ---
-    baseline_base_sell_hr = Decimal(Baseline) / (BASE_USD if BASE_USD > 0 else Decimal("1"))
-    baseline_base_sell_base_units = to_base_units(str(baseline_base_sell_hr), base_dec)
-    resp_sell_baseline = get_price(
-        sell_token=base_addr,
-        buy_token=quote_addr,
-        sell_amount=baseline_base_sell_base_units,
-        api_key=api_key,
-    )
-    parsed_sell_baseline = parse_0x_price_response(resp_sell_baseline, sell_decimals=base_dec, buy_decimals=quote_dec)
-    unit_sell_baseline = Decimal(parsed_sell_baseline["unit_price_human"])  # QUOTE per 1 BASE
-
-    # --- print context header ---
-    print("\n=== LADDER TEST (pair: {}) ===".format(pair_addr))
-    print("base: {} ({})  quote: {} ({})".format(base_sym, base_addr, quote_sym, quote_addr))
-    print("USD ladder:", USD_LADDER)
-    print("Baseline USD:", BASELINE_USD)
-    print("QUOTE_USD ({}): {}".format(quote_sym, _fmt(QUOTE_USD, 6)))
-    print("BASE_USD  ({}): {}".format(base_sym, _fmt(BASE_USD, 12)))
-    _sleep()
-
-    # --- walk ladder both directions ---
+    # BUY legs (QUOTE->BASE) only depend on QUOTE_USD, so they go out together with
+    # the BUY baseline; SELL sizing needs BASE_USD from that baseline, so the SELL
+    # baseline + legs follow as soon as it returns. get_price paces everything.
+    ex = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        # --- get baseline BUY (QUOTE->BASE) at BASELINE_USD to infer token USD ---
+        # 0x expects base units
+        baseline_quote_sell_base_units = usd_to_base_units(BASELINE_USD, QUOTE_USD, quote_dec)
+        buy_baseline_fut = ex.submit(_quote, api_key, quote_addr, base_addr, baseline_quote_sell_base_units, quote_dec, base_dec)
+
+        # --- BUY legs: sell QUOTE for BASE at each USD ---
+        buy_futs = []
+        for usd in USD_LADDER:
+            sell_quote_units = usd_to_base_units(usd, QUOTE_USD, quote_dec) if QUOTE_USD > 0 else "0"
+            leg = (quote_addr, base_addr, sell_quote_units, quote_dec, base_dec)
+            buy_futs.append(ex.submit(_quote, api_key, *leg))
+
+        parsed_buy_baseline = buy_baseline_fut.result()
+        # unit price: BASE per 1 QUOTE
+        unit_buy_baseline = Decimal(parsed_buy_baseline["unit_price_human"])
+        # token USD = QUOTE_USD / (BASE per QUOTE)
+        BASE_USD = QUOTE_USD / unit_buy_baseline if unit_buy_baseline > 0 else Decimal(0)
+        base_px = BASE_USD if BASE_USD > 0 else Decimal("1")
+
+        # --- also get baseline SELL (BASE->QUOTE) for SELL impact baseline ---
+        baseline_base_sell_base_units = usd_to_base_units(BASELINE_USD, base_px, base_dec)
+        sell_baseline_fut = ex.submit(_quote, api_key, base_addr, quote_addr, baseline_base_sell_base_units, base_dec, quote_dec)
+
+        # --- SELL legs: sell BASE for QUOTE at each USD ---
+        sell_futs = []
+        for usd in USD_LADDER:
+            leg = (base_addr, quote_addr, usd_to_base_units(usd, base_px, base_dec), base_dec, quote_dec)
+            sell_futs.append(ex.submit(_quote, api_key, *leg))
+
+        parsed_sell_baseline = sell_baseline_fut.result()
+        unit_sell_baseline = Decimal(parsed_sell_baseline["unit_price_human"])  # QUOTE per 1 BASE
+
+        # --- print context header ---
+        print("\n=== LADDER TEST (pair: {}) ===".format(pair_addr))
+        print("base: {} ({})  quote: {} ({})".format(base_sym, base_addr, quote_sym, quote_addr))
+        print("USD ladder:", USD_LADDER)
+        print("Baseline USD:", BASELINE_USD)
+        print("QUOTE_USD ({}): {}".format(quote_sym, _fmt(QUOTE_USD, 6)))
+        print("BASE_USD  ({}): {}".format(base_sym, _fmt(BASE_USD, 12)))
+
+        buys = [f.result() for f in buy_futs]
+        sells = [f.result() for f in sell_futs]
+    finally:
+        # on error don't wait for quotes nobody will read
+        ex.shutdown(wait=True, cancel_futures=True)
+
+    buy_base_f = float(unit_buy_baseline)
+    sell_base_f = float(unit_sell_baseline)
     rows = []
-    for usd in USD_LADDER:
-        usd_d = Decimal(usd)
-
-        # BUY: sell QUOTE for BASE at this USD
-        sell_quote_hr = usd_d / QUOTE_USD if QUOTE_USD > 0 else Decimal(0)
-        sell_quote_units = to_base_units(str(sell_quote_hr), quote_dec)
-        buy_resp = get_price(
-            sell_token=quote_addr,
-            buy_token=base_addr,
-            sell_amount=sell_quote_units,
-            api_key=api_key,
-        )
-        buy_parsed = parse_0x_price_response(buy_resp, sell_decimals=quote_dec, buy_decimals=base_dec)
-        unit_buy = Decimal(buy_parsed["unit_price_human"]) if buy_parsed["unit_price_human"] != "0" else Decimal(0)
-        buy_bps = _impact_bps(unit_buy_baseline, unit_buy)
-        _sleep()
-
-        # SELL: sell BASE for QUOTE at this USD
-        sell_base_hr = usd_d / (BASE_USD if BASE_USD > 0 else Decimal("1"))
-        sell_base_units = to_base_units(str(sell_base_hr), base_dec)
-        sell_resp = get_price(
-            sell_token=base_addr,
-            buy_token=quote_addr,
-            sell_amount=sell_base_units,
-            api_key=api_key,
-        )
-        sell_parsed = parse_0x_price_response(sell_resp, sell_decimals=base_dec, buy_decimals=quote_dec)
-        unit_sell = Decimal(sell_parsed["unit_price_human"]) if sell_parsed["unit_price_human"] != "0" else Decimal(0)
-        sell_bps = _impact_bps(unit_sell_baseline, unit_sell)
-        _sleep()
+    for usd, buy_parsed, sell_parsed in zip(USD_LADDER, buys, sells):
+        buy_bps = _impact_bps(buy_base_f, float(buy_parsed["unit_price_human"]))
+        sell_bps = _impact_bps(sell_base_f, float(sell_parsed["unit_price_human"]))
 
         rows.append((
             usd,
@@ -229,7 +236,7 @@ def run() -> None:
     print("- BUY = {}→{} (route-only impact; fees separate)".format(quote_sym, base_sym))
     print("- SELL = {}→{}".format(base_sym, quote_sym))
     print("- Impact bps is vs ${} baseline (positive = worse price at size).".format(BASELINE_USD))
-    print("- You can raise RPS by reducing sleep, but stay under 10 rps.")
+    print("- Quotes run concurrently, capped at quote.ZEROX_MAX_RPS (keep it under 10 rps).")
 
 if __name__ == "__main__":
     run()
@@ -18,19 +18,31 @@
 #   - ladder_runs(id, started_at, base_usd, pair_address, ...)
 #   - ladder_points(run_id, usd, buy_bps, sell_bps)
 
+import atexit
 import json
+import os
+import queue
 import sqlite3
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
+# matplotlib is imported inside the plotting functions: pyplot + font cache setup
+# costs most of a second, and the select/configure menus never draw anything.
 
-from db_helper import DB_PATH  # uses config.json under the hood
+from db_helper import open_conn  # DB_PATH from config.json; WAL/mmap pragma profile
 
 CONFIG_FILE = Path("config.json")
 
+# overlay_menu renders save-only pairs in parallel processes (CPU-bound: Agg + PNG)
+PLOT_MAX_WORKERS = os.cpu_count() or 1
+
+# watch_live_overlay: how often the GUI timer checks for a frame from the prefetch thread
+LIVE_POLL_SEC = 0.25
+
 # --------------------------- Config helpers ---------------------------
 
 _PM_DEFAULTS = {
@@ -41,6 +53,7 @@ _PM_DEFAULTS = {
     "outdir": "plots",
     "weight_exp": 1.0,
     "refresh_sec": 5.0,
+    "dpi": 150,  # saved PNG resolution (render + encode cost scale with dpi^2)
     "last_pair": None,  # persisted last selection from "Select pair(s)" menu
 }
 
@@ -86,79 +99,116 @@ def _store_pm_cfg(cfg: Dict[str, Any], pm: Dict[str, Any]) -> None:
 # --------------------------- DB helpers -------------------------------
 
 def connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # shared pragma profile: WAL lets plots read while a ladder run is writing
+    return open_conn()
+
+# SQL text lives in module-level constants (as in db_helper): open_conn()'s
+# statement cache is keyed by the SQL string, so every call reuses one prepared
+# statement instead of re-parsing/planning per live tick.
+SQL_LIST_PAIRS = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address, quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+ORDER BY base_symbol, quote_symbol, pair_address
+"""
 
 def list_pairs(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
-    cur = conn.execute("""
-        SELECT base_address, base_symbol, base_decimals,
-               pair_address, quote_address, quote_symbol, quote_decimals
-        FROM token_pairs
-        ORDER BY base_symbol, quote_symbol, pair_address
-    """)
+    cur = conn.execute(SQL_LIST_PAIRS)
     return [dict(r) for r in cur.fetchall()]
 
+# Pair metadata is looked up again on every menu pass / live tick; it rarely
+# changes, so keep it per process for CACHE_TTL_SEC (keyed like the SQL: lowercased).
+CACHE_TTL_SEC = 60.0
+_PAIR_META_CACHE: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+
+SQL_SELECT_PAIR_META = """
+SELECT base_address, base_symbol, base_decimals,
+       pair_address, quote_address, quote_symbol, quote_decimals
+FROM token_pairs
+WHERE lower(pair_address) = lower(?)
+LIMIT 1
+"""
+
 def get_pair_meta(conn: sqlite3.Connection, pair_address: str) -> Optional[Dict[str, Any]]:
-    cur = conn.execute("""
-        SELECT base_address, base_symbol, base_decimals,
-               pair_address, quote_address, quote_symbol, quote_decimals
-        FROM token_pairs
-        WHERE lower(pair_address) = lower(?)
-        LIMIT 1
-    """, (pair_address,))
+    key = pair_address.lower()
+    now = time.monotonic()
+    hit = _PAIR_META_CACHE.get(key)
+    if hit is not None and now - hit[0] < CACHE_TTL_SEC:
+        return hit[1]
+    cur = conn.execute(SQL_SELECT_PAIR_META, (pair_address,))
     r = cur.fetchone()
-    return dict(r) if r else None
-
-def get_runs_for_pair(conn: sqlite3.Connection, pair_address: str, limit: int) -> List[Dict[str, Any]]:
-    # Fetch the latest N (DESC + LIMIT), then re-order ASC for plotting
-    cur = conn.execute("""
-        SELECT id, started_at, base_usd FROM (
-            SELECT id, started_at, base_usd
-            FROM ladder_runs
-            WHERE lower(pair_address) = lower(?)
-            ORDER BY started_at DESC, id DESC
-            LIMIT ?
-        ) AS recent
-        ORDER BY started_at ASC, id ASC
-    """, (pair_address, int(limit)))
-    return [dict(r) for r in cur.fetchall()]
-
+    meta = dict(r) if r else None
+    _PAIR_META_CACHE[key] = (now, meta)
+    return meta
+
+# get_runs_for_pair rows: a structured array instead of one dict per run
+RUN_DTYPE = np.dtype([("id", np.int64), ("started_at", np.int64), ("base_usd", np.float64)])
+# Latest N (DESC + LIMIT), re-ordered ASC for plotting
+SQL_SELECT_RECENT_RUNS = """
+SELECT id, started_at, base_usd FROM (
+    SELECT id, started_at, base_usd
+    FROM ladder_runs
+    WHERE lower(pair_address) = lower(?)
+    ORDER BY started_at DESC, id DESC
+    LIMIT ?
+) AS recent
+ORDER BY started_at ASC, id ASC
+"""
+
+def get_runs_for_pair(conn: sqlite3.Connection, pair_address: str, limit: int) -> np.ndarray:
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(SQL_SELECT_RECENT_RUNS, (pair_address, int(limit)))
+    return np.array(cur.fetchall(), dtype=RUN_DTYPE)
+
+SQL_SELECT_RUNS_KEY = """
+SELECT MAX(id), COUNT(*) FROM ladder_runs WHERE lower(pair_address) = lower(?)
+"""
+
+def get_runs_key(conn: sqlite3.Connection, pair_address: str) -> Tuple[Optional[int], int]:
+    """(newest run id, run count) for a pair: changes whenever a run is added or deleted."""
+    return tuple(conn.execute(SQL_SELECT_RUNS_KEY, (pair_address,)).fetchone())
+
+SQL_SELECT_RUN_POINTS = """
+SELECT usd, buy_bps, sell_bps
+FROM ladder_points
+WHERE run_id = ?
+ORDER BY usd ASC
+"""
 
 def get_points_for_run(conn: sqlite3.Connection, run_id: int) -> List[Dict[str, Any]]:
-    cur = conn.execute("""
-        SELECT usd, buy_bps, sell_bps
-        FROM ladder_points
-        WHERE run_id = ?
-        ORDER BY usd ASC
-    """, (int(run_id),))
+    cur = conn.execute(SQL_SELECT_RUN_POINTS, (int(run_id),))
     return [dict(r) for r in cur.fetchall()]
 
-# --------------------------- Transforms -------------------------------
+SQL_SELECT_POINTS_BATCH = """
+SELECT run_id, usd, IFNULL(buy_bps, 0.0), IFNULL(sell_bps, 0.0)
+FROM ladder_points
+WHERE run_id IN (SELECT value FROM json_each(?))
+ORDER BY run_id, usd ASC
+"""
 
-def _to_dt(unix_ts: int) -> datetime:
-    try:
-        return datetime.utcfromtimestamp(int(unix_ts))
-    except Exception:
-        return datetime.utcfromtimestamp(0)
+def get_points_batch_tuples(conn: sqlite3.Connection, run_ids: List[int]) -> List[Tuple[int, float, float, float]]:
+    """
+    (run_id, usd, buy_bps, sell_bps) for many runs in one query (served by the (run_id, usd) PK),
+    ordered by run_id, usd; NULL bps -> 0.0. Plain tuples: no Row/dict per point on the plot path.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(SQL_SELECT_POINTS_BATCH, (json.dumps([int(i) for i in run_ids]),))
+    return cur.fetchall()
+
+# --------------------------- Transforms -------------------------------
 
-def rolling_mean(xs: List[float], w: int) -> List[float]:
+def rolling_mean(xs: np.ndarray, w: int) -> np.ndarray:
+    """Trailing w-point mean (cumsum trick); the first w-1 values pass through unsmoothed."""
     if w <= 1 or w > len(xs):
-        return xs[:]
-    out = []
-    s = 0.0
-    for i, v in enumerate(xs):
-        s += v
-        if i >= w:
-            s -= xs[i - w]
-        if i >= w - 1:
-            out.append(s / w)
-        else:
-            out.append(xs[i])
-    return out
+        return xs
+    cs = np.concatenate(([0.0], np.cumsum(xs)))
+    avg = (cs[w:] - cs[:-w]) / w
+    return np.concatenate((xs[:w - 1], avg))
 
-def _pad_minmax(vals: List[float], pad_ratio: float = 0.2) -> Tuple[float, float]:
-    vmin, vmax = min(vals), max(vals)
+def _pad_minmax(vals: np.ndarray, pad_ratio: float = 0.2) -> Tuple[float, float]:
+    vmin, vmax = float(vals.min()), float(vals.max())
     if vmax == vmin:
         pad = abs(vmin) * pad_ratio if vmin != 0 else 1.0
         return vmin - pad, vmax + pad
@@ -166,97 +216,322 @@ def _pad_minmax(vals: List[float], pad_ratio: float = 0.2) -> Tuple[float, float
     pad = span * pad_ratio
     return vmin - pad, vmax + pad
 
+# Rendered price points are capped at this many per horizontal pixel of the axes
+VIEWPORT_OVERSAMPLE = 2
+MINMAX_RATIO = 4  # MinMax preselection keeps ~MINMAX_RATIO candidates per output point
+
+def _minmax_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices (sorted, first/last kept) of n_out points approximating the y(x) shape:
+    MinMaxLTTB — per-bin min/max preselection (n_out*MINMAX_RATIO candidates), then
+    Largest-Triangle-Three-Buckets over the candidates. Returns all indices if n <= n_out.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # 1) MinMax: argmin/argmax of y per equal-count bin of the inner points
+    n_bins = n_out * MINMAX_RATIO // 2
+    if n - 2 > 2 * n_bins:
+        edges = np.linspace(0, n - 2, n_bins + 1).astype(np.int64)
+        bin_id = np.repeat(np.arange(n_bins), np.diff(edges))
+        order = np.lexsort((y[1:-1], bin_id))  # grouped by bin, ascending y within a bin
+        cand = np.unique(np.r_[0, order[edges[:-1]] + 1, order[edges[1:] - 1] + 1, n - 1])
+    else:
+        cand = np.arange(n)
+    m = len(cand)
+    if m <= n_out:
+        return cand
+
+    # 2) LTTB: per bucket, the candidate forming the largest triangle with the last
+    #    pick and the next bucket's mean
+    cx, cy = x[cand], y[cand]
+    edges = np.linspace(1, m - 1, n_out - 1).astype(np.int64)  # n_out-2 buckets over cand[1:-1]
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, m - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nx, ny = cx[hi:edges[i + 2]].mean(), cy[hi:edges[i + 2]].mean()
+        else:
+            nx, ny = cx[m - 1], cy[m - 1]
+        area = np.abs((cx[a] - nx) * (cy[lo:hi] - cy[a]) - (cx[a] - cx[lo:hi]) * (ny - cy[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return cand[out]
+
+def _viewport_points(ax, dpi: Optional[float] = None) -> int:
+    """Max price points worth drawing on ax (VIEWPORT_OVERSAMPLE per pixel at dpi, default: figure dpi)."""
+    scale = (dpi / ax.figure.dpi) if dpi else 1.0
+    return max(3, int(ax.bbox.width * scale) * VIEWPORT_OVERSAMPLE)
+
+def _thin_series(times: np.ndarray, tok_usd: np.ndarray, per_run_points: List["RungArrays"], n_out: int):
+    """
+    (times, tok_usd, per_run_points) reduced to at most n_out runs via _minmax_lttb.
+    Each kept run keeps its own ladder, so a drawn segment shows the bands of the run it starts at.
+    """
+    if len(times) <= n_out:
+        return times, tok_usd, per_run_points
+    idx = _minmax_lttb(times, tok_usd, n_out)
+    return times[idx], tok_usd[idx], [per_run_points[i] for i in idx.tolist()]
+
 # ------- Per-rung dominance and weights (for one run / one ladder) -------
 
-def _per_rung_strengths(points: List[Dict[str, Any]], weight_exp: float):
+RungArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (usds, buy_bps, sell_bps), NULL bps -> 0.0
+
+# A side's band is only drawn where its raw dominance reaches this; below it the band
+# would just be the 0.06 alpha floor (e.g. every resistance band of a supportive rung).
+BAND_MIN_DOMINANCE = 0.02
+
+_NO_RUNGS: RungArrays = (np.empty(0), np.empty(0), np.empty(0))
+
+def _rung_arrays_by_run(rows: List[Tuple[int, float, float, float]]) -> Dict[int, RungArrays]:
+    """get_points_batch_tuples rows -> run_id: RungArrays (one array build, then per-run slices)."""
+    if not rows:
+        return {}
+    arr = np.array(rows, dtype=np.float64)
+    run_col = arr[:, 0].astype(np.int64)
+    cols = np.ascontiguousarray(arr[:, 1:].T)  # usd / buy / sell rows -> contiguous slices
+    bounds = np.r_[np.flatnonzero(np.r_[True, run_col[1:] != run_col[:-1]]), len(arr)]
+    return {
+        int(run_col[lo]): (cols[0, lo:hi], cols[1, lo:hi], cols[2, lo:hi])
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    }
+
+# Struct-of-arrays view of many runs' ladders: flat usd/buy/sell arrays plus
+# offsets (len runs+1) so run i's rungs are [offsets[i]:offsets[i+1]]
+PointsBlock = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+def _points_block(per_run_points: List[RungArrays]) -> PointsBlock:
+    """Concatenate per-run RungArrays into one PointsBlock (one copy per column)."""
+    lengths = np.fromiter((len(p[0]) for p in per_run_points), dtype=np.int64, count=len(per_run_points))
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if not offsets[-1]:
+        return np.empty(0), np.empty(0), np.empty(0), offsets
+    usd, buy, sell = (np.concatenate([p[c] for p in per_run_points]) for c in range(3))
+    return usd, buy, sell, offsets
+
+SegmentStrengths = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+def _segment_strengths(per_run_points: List[RungArrays], weight_exp: float) -> SegmentStrengths:
     """
-    For each rung, compute:
-      - weight: w_r = (USD_r ** weight_exp)
+    For each rung of each run (one row per run, padded to the longest ladder), compute:
+      - weight: w_r = (USD_r ** weight_exp), normalized per run (uniform if a run's total is 0)
       - support_alpha_r (green)  = max(0, buy - sell) / (|buy| + |sell| + eps)
       - resist_alpha_r  (red)    = max(0, sell - buy) / (|buy| + |sell| + eps)
-    Returns (usds, weights_norm, support_alphas, resist_alphas).
+    Returns (weights_norm, support_alphas, resist_alphas, support_drawn, resist_drawn) as
+    (runs, R) arrays; the bool masks mark raw dominance >= BAND_MIN_DOMINANCE.
+    Padding has zero weight and is never drawn.
+    All runs are computed at once on the flat PointsBlock, then scattered into the grid.
     """
-    if not points:
-        return [], [], [], []
+    usd, buy, sell, offsets = _points_block(per_run_points)
+    lengths = np.diff(offsets)
+    n, r = len(lengths), int(lengths.max(initial=0))
+    row = np.repeat(np.arange(n), lengths)
+    col = np.arange(len(usd)) - offsets[row]
 
-    eps = 1e-6
-    usds, weights, sup_alphas, res_alphas = [], [], [], []
-
-    for p in points:
-        usd = float(p.get("usd") or 0.0)
-        b = p.get("buy_bps")
-        s = p.get("sell_bps")
-        b0 = 0.0 if b is None else float(b)
-        s0 = 0.0 if s is None else float(s)
-
-        w = (usd ** weight_exp) if usd > 0 else 0.0
-        denom = abs(b0) + abs(s0) + eps
-        sup = max(0.0, b0 - s0) / denom
-        res = max(0.0, s0 - b0) / denom
-
-        usds.append(usd)
-        weights.append(w)
-        # clamp alphas to a pleasing range
-        sup_alphas.append(max(0.06, min(0.90, sup)))
-        res_alphas.append(max(0.06, min(0.90, res)))
-
-    total_w = sum(weights)
-    if total_w <= 0:
-        weights_norm = [1.0 / len(usds)] * len(usds)
-    else:
-        weights_norm = [w / total_w for w in weights]
+    w = np.power(usd, weight_exp, out=np.zeros_like(usd), where=usd > 0)
+    totals = np.bincount(row, weights=w, minlength=n)
+    flat_w = np.divide(w, totals[row], out=np.zeros_like(w), where=totals[row] > 0)
+    uniform = totals[row] <= 0
+    flat_w[uniform] = 1.0 / lengths[row[uniform]]
 
-    return usds, weights_norm, sup_alphas, res_alphas
+    weights, b0, s0 = np.zeros((n, r)), np.zeros((n, r)), np.zeros((n, r))
+    weights[row, col], b0[row, col], s0[row, col] = flat_w, buy, sell
+
+    eps = 1e-6
+    denom = np.abs(b0) + np.abs(s0) + eps
+    sup_raw = np.maximum(0.0, b0 - s0) / denom
+    res_raw = np.maximum(0.0, s0 - b0) / denom
+    # clamp alphas to a pleasing range
+    sup_alphas = np.clip(sup_raw, 0.06, 0.90)
+    res_alphas = np.clip(res_raw, 0.06, 0.90)
+    return weights, sup_alphas, res_alphas, sup_raw >= BAND_MIN_DOMINANCE, res_raw >= BAND_MIN_DOMINANCE
 
 # --------------------------- Series builder ----------------------------
 
+# A run's points are written in the same transaction as the run and never change,
+# so live redraws only need to fetch the runs they haven't seen. Keyed by
+# (id, started_at): a deleted newest run's id can be reused by the next insert.
+RUNG_CACHE_MAX = 8192
+_RUNG_CACHE: Dict[Tuple[int, int], RungArrays] = {}
+
+def _cached_rung_arrays(conn: sqlite3.Connection, runs: np.ndarray) -> List[RungArrays]:
+    """RungArrays per run (same order), querying ladder_points only for uncached runs."""
+    keys = list(zip(runs["id"].tolist(), runs["started_at"].tolist()))
+    missing = [k for k in keys if k not in _RUNG_CACHE]
+    if missing:
+        fetched = _rung_arrays_by_run(get_points_batch_tuples(conn, [run_id for run_id, _ in missing]))
+        for k in missing:
+            _RUNG_CACHE[k] = fetched.get(k[0], _NO_RUNGS)
+    out = [_RUNG_CACHE[k] for k in keys]
+    while len(_RUNG_CACHE) > RUNG_CACHE_MAX:
+        del _RUNG_CACHE[next(iter(_RUNG_CACHE))]  # oldest inserted first
+    return out
+
 def build_series(conn: sqlite3.Connection, pair: str, limit: int, smooth: int):
     runs = get_runs_for_pair(conn, pair, limit=limit)
-    if not runs:
-        return [], [], [], []  # times, tok_usd, per_run_points, runs
+    if not len(runs):
+        return np.empty(0), np.empty(0), [], runs  # times, tok_usd, per_run_points (RungArrays per run), runs
+
+    import matplotlib.dates as mdates
 
-    times = [_to_dt(r["started_at"]) for r in runs]
-    tok_usd = [float(r["base_usd"]) for r in runs]
+    # times: float64 Matplotlib date numbers (UTC), converted once here so the
+    # geometry and data limits never re-run date conversion; out-of-range stamps
+    # clamp to the epoch
+    times = mdates.date2num(np.maximum(runs["started_at"], 0).astype("datetime64[s]"))
+    tok_usd = runs["base_usd"]
     if smooth and smooth > 1:
         tok_usd = rolling_mean(tok_usd, smooth)
 
-    per_run_points: List[List[Dict[str, Any]]] = []
-    for r in runs:
-        pts = get_points_for_run(conn, r["id"])
-        per_run_points.append(pts)
+    per_run_points = _cached_rung_arrays(conn, runs)
 
     return times, tok_usd, per_run_points, runs
 
 # --------------------------- Plotting ---------------------------------
 
-def _draw_banded_side(ax, xseg, y_line0, y_line1, y_base0, y_base1, weights_norm, alphas, color: str):
+def _band_mesh(xs: np.ndarray, ys: np.ndarray, y_base: float, hi: np.ndarray,
+               rgba, alphas: np.ndarray, drawn: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Draw stacked bands between base and line across a segment.
-    Each band k occupies fractional interval [cum, cum+wk] of the vertical gap.
+    One side's stacked bands between y_base and the price line as a QuadMesh grid:
+    (coords (R+1, 2S, 2), colors (R*(2S-1), 4)). Columns 2i/2i+1 hold segment i's band
+    boundaries (cumulative weights hi, shared by both sides) at its two endpoints.
+    Boundaries don't line up from one segment to the next, so the cells joining them
+    (odd columns) are zero-width and transparent; undrawn bands are transparent too.
     """
-    if not weights_norm or sum(weights_norm) <= 0:
-        return
+    s, r = hi.shape
+    bounds = np.concatenate((np.zeros((s, 1)), hi), axis=1).T  # (R+1, S)
+    coords = np.empty((r + 1, 2 * s, 2))
+    coords[:, 0::2, 0], coords[:, 1::2, 0] = xs[:-1], xs[1:]
+    coords[:, 0::2, 1] = y_base + bounds * (ys[:-1] - y_base)
+    coords[:, 1::2, 1] = y_base + bounds * (ys[1:] - y_base)
+    colors = np.zeros((r, 2 * s - 1, 4))
+    colors[:, 0::2, :3] = rgba[:3]
+    colors[:, 0::2, 3] = np.where(drawn, alphas, 0.0).T
+    return coords, colors.reshape(-1, 4)
+
+BandMesh = Tuple[np.ndarray, np.ndarray]
+OverlayGeometry = Tuple[List[BandMesh], np.ndarray, np.ndarray]
+
+def _overlay_geometry(xs: np.ndarray, tok_usd, per_run_points, ymin: float, ymax: float, weight_exp: float) -> OverlayGeometry:
+    """
+    Band meshes and price segments + RGBA for every segment:
+    ([support, resistance] (coords, colors) meshes, segments (runs-1, 2, 2), line_colors (runs-1, 4)).
+    Segment i uses the rungs of run i: support bands below the line, resistance above.
+    Each side is one (segments, rungs) grid built in a single broadcast.
+    """
+    from matplotlib.colors import to_rgba
+
+    ys = np.asarray(tok_usd, dtype=np.float64)
+    green, red, black = to_rgba("green"), to_rgba("red"), to_rgba("black")
+    weights, sup_alphas, res_alphas, sup_drawn, res_drawn = _segment_strengths(per_run_points[:-1], weight_exp)
+
+    # 1) Stacked bands BELOW (support) and ABOVE (resistance); rungs keep their slot
+    #    in the stack, negligible ones are just not drawn
+    meshes = []
+    if weights.size:
+        hi = np.cumsum(weights, axis=1)
+        meshes = [_band_mesh(xs, ys, ymin, hi, green, sup_alphas, sup_drawn),
+                  _band_mesh(xs, ys, ymax, hi, red, res_alphas, res_drawn)]
+
+    # 2) Segment line color = stronger side; opacity scales with dominance
+    segments = np.empty((len(xs) - 1, 2, 2))
+    segments[:, 0, 0], segments[:, 1, 0] = xs[:-1], xs[1:]
+    segments[:, 0, 1], segments[:, 1, 1] = ys[:-1], ys[1:]
+    # per-segment weighted dominance, one fused multiply-reduce per side (no (S, R) temporaries)
+    seg_sup = np.einsum("ij,ij->i", weights, sup_alphas)
+    seg_res = np.einsum("ij,ij->i", weights, res_alphas)
+    seg_sum = seg_sup + seg_res
+    line_colors = np.empty((len(segments), 4))
+    line_colors[:, :3] = np.where((seg_sup >= seg_res)[:, None], green[:3], red[:3])
+    line_colors[:, 3] = 0.35 + 0.65 * (np.abs(seg_sup - seg_res) / np.maximum(seg_sum, 1e-6))
+    flat = seg_sum <= 1e-6
+    line_colors[flat, :3] = black[:3]
+    line_colors[flat, 3] = 0.6
+
+    return meshes, segments, line_colors
+
+def _new_overlay_artists(ax):
+    """(price LineCollection, band QuadMesh list) on ax; filled by _set_overlay."""
+    from matplotlib.collections import LineCollection
+
+    line = LineCollection([], linewidths=2.4, capstyle="projecting")
+    ax.add_collection(line)
+    ax.xaxis_date()
+    return line, []
+
+def _clear_overlay(artists) -> None:
+    """Drop the band meshes and empty the price line."""
+    line, meshes = artists
+    for mesh in meshes:
+        mesh.remove()
+    meshes.clear()
+    line.set_segments([])
+
+def _apply_overlay(ax, artists, times, tok_usd, geometry: OverlayGeometry) -> None:
+    """
+    Swap prebuilt geometry into the overlay artists and rescale x (times: date numbers).
+    A QuadMesh's grid shape is fixed, so the band meshes are replaced; the line is updated in place.
+    """
+    from matplotlib.collections import QuadMesh
+
+    line, meshes = artists
+    mesh_data, segments, line_colors = geometry
+    _clear_overlay(artists)
+    for coords, colors in mesh_data:
+        # zorder just under the line's default so the price line stays on top of the bands
+        mesh = QuadMesh(coords, facecolors=colors, edgecolors="none", linewidths=0,
+                        antialiased=True, zorder=0.9)
+        ax.add_collection(mesh, autolim=False)
+        meshes.append(mesh)
+    line.set_segments(segments)
+    line.set_color(line_colors)
+    # collections aren't tracked by ax.relim(); rebuild the data limits from the price points
+    ax.ignore_existing_data_limits = True
+    ax.update_datalim(np.column_stack((times, tok_usd)))
+    ax.autoscale_view(scaley=False)
+
+def _set_overlay(ax, artists, times, tok_usd, per_run_points, ymin: float, ymax: float, weight_exp: float) -> None:
+    """Build the overlay geometry and swap it into the artists (see _apply_overlay)."""
+    _apply_overlay(ax, artists, times, tok_usd,
+                   _overlay_geometry(times, tok_usd, per_run_points, ymin, ymax, weight_exp))
+
+def _draw_overlay(ax, times, tok_usd, per_run_points, ymin: float, ymax: float, weight_exp: float) -> None:
+    """
+    Bands + price line for every segment, as one QuadMesh per side and one LineCollection
+    (a few artists in total instead of 2*rungs fills + 1 line per segment).
+    """
+    _set_overlay(ax, _new_overlay_artists(ax), times, tok_usd, per_run_points, ymin, ymax, weight_exp)
 
-    cum = 0.0
-    for wk, ak in zip(weights_norm, alphas):
-        lo = cum
-        hi = cum + wk
-        cum = hi
-
-        # segment interpolation at endpoints
-        y_lo0 = y_base0 + lo * (y_line0 - y_base0)
-        y_hi0 = y_base0 + hi * (y_line0 - y_base0)
-        y_lo1 = y_base1 + lo * (y_line1 - y_base1)
-        y_hi1 = y_base1 + hi * (y_line1 - y_base1)
-
-        ax.fill_between(
-            xseg,
-            [y_lo0, y_lo1],
-            [y_hi0, y_hi1],
-            color=color,
-            alpha=ak,
-            linewidth=0
-        )
+# (outdir, base_fname) -> next counter suffix to try (-1: the unsuffixed name)
+_SAVE_NEXT: Dict[Tuple[Path, str], int] = {}
+
+def _next_save_path(outdir: Path, base_fname: str, ext: str) -> Path:
+    """
+    Next free name in the base, base_000, base_001, ... sequence. The directory is
+    scanned once per base name per process; later saves continue from the cached
+    counter (one exists() check instead of one per earlier plot).
+    """
+    key = (outdir, base_fname)
+    n = _SAVE_NEXT.get(key)
+    if n is None:
+        n = -1
+        prefix = f"{base_fname}_"
+        with os.scandir(outdir) as it:
+            for entry in it:
+                name = entry.name
+                if name == f"{base_fname}{ext}":
+                    n = max(n, 0)
+                elif name.startswith(prefix) and name.endswith(ext) and name[len(prefix):-len(ext)].isdigit():
+                    n = max(n, int(name[len(prefix):-len(ext)]) + 1)
+    while True:
+        candidate = outdir / (f"{base_fname}{ext}" if n < 0 else f"{base_fname}_{n:03d}{ext}")
+        n += 1
+        if not candidate.exists():  # another process may have written it meanwhile
+            _SAVE_NEXT[key] = n
+            return candidate
 
 def plot_banded_sr_overlay_for_pair(
     conn: sqlite3.Connection,
@@ -269,63 +544,35 @@ def plot_banded_sr_overlay_for_pair(
     show: bool,
     save: bool,
     outdir: Path,
+    dpi: int = 150,
 ) -> Optional[Path]:
     # Build series and per-run ladder points
     times, tok_usd, per_run_points, runs = build_series(conn, pair, limit, smooth)
-    if not times:
+    if not len(runs):
         return None
 
     bs = (meta.get("base_symbol") or "BASE").upper()
-    fig, ax = plt.subplots()
+    if show:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots()
+    else:
+        # save-only: plain Agg figure, no pyplot state machine / GUI backend involved
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
 
     # Price axis with ±20% padding
     ymin, ymax = _pad_minmax(tok_usd, pad_ratio=0.2)
     ax.set_ylim(ymin, ymax)
 
-    # Draw everything per segment so line/bands can change color/strength
-    for i in range(len(times) - 1):
-        xseg = [times[i], times[i + 1]]
-        y0, y1 = tok_usd[i], tok_usd[i + 1]
-
-        # rung info from the starting run for the segment
-        pts = per_run_points[i]
-        _, weights_norm, sup_alphas, res_alphas = _per_rung_strengths(pts, weight_exp=weight_exp)
-
-        # 1) Stacked bands BELOW (support) and ABOVE (resistance)
-        _draw_banded_side(
-            ax, xseg,
-            y_line0=y0, y_line1=y1,
-            y_base0=ymin, y_base1=ymin,
-            weights_norm=weights_norm,
-            alphas=sup_alphas,
-            color="green"
-        )
-        _draw_banded_side(
-            ax, xseg,
-            y_line0=y0, y_line1=y1,
-            y_base0=ymax, y_base1=ymax,
-            weights_norm=weights_norm,
-            alphas=res_alphas,
-            color="red"
-        )
-
-        # 2) Segment line color = stronger side; opacity scales with dominance
-        seg_sup = sum(w * a for w, a in zip(weights_norm, sup_alphas))
-        seg_res = sum(w * a for w, a in zip(weights_norm, res_alphas))
-        seg_sum = seg_sup + seg_res
-        if seg_sum <= 1e-6:
-            line_color = "black"
-            line_alpha = 0.6
-        else:
-            if seg_sup >= seg_res:
-                line_color = "green"
-                dom = seg_sup - seg_res
-            else:
-                line_color = "red"
-                dom = seg_res - seg_sup
-            line_alpha = 0.35 + 0.65 * (dom / seg_sum)
+    # Never draw more segments than the output has pixels for
+    times, tok_usd, per_run_points = _thin_series(
+        times, tok_usd, per_run_points, _viewport_points(ax, None if show else dpi))
 
-        ax.plot(xseg, [y0, y1], color=line_color, alpha=line_alpha, linewidth=2.4)
+    # Per-segment bands/line so color/strength can change along the series
+    _draw_overlay(ax, times, tok_usd, per_run_points, ymin, ymax, weight_exp)
 
     ax.set_title(
         f"{bs} — Price with per-rung Support/Resistance bands\n"
@@ -346,15 +593,9 @@ def plot_banded_sr_overlay_for_pair(
             base_fname = f"sr_banded_{bs}_{pair_suffix}_w{weight_exp:.2f}"
             ext = ".png"
 
-            # Find next available filename with counter
-            candidate = outdir / f"{base_fname}{ext}"
-            counter = 0
-            while candidate.exists():
-                candidate = outdir / f"{base_fname}_{counter:03d}{ext}"
-                counter += 1
-
-            save_path = candidate
-            fig.savefig(save_path, dpi=150, bbox_inches="tight")
+            save_path = _next_save_path(outdir, base_fname, ext)
+            # compress_level=1: zlib's fast end; these flat-colour plots barely grow
+            fig.savefig(save_path, dpi=dpi, bbox_inches="tight", pil_kwargs={"compress_level": 1})
             print(f"[save] wrote: {save_path}")
         except Exception as e:
             print(f"[save][error] {e!r}  (dir={outdir})")
@@ -364,101 +605,131 @@ def plot_banded_sr_overlay_for_pair(
             plt.show()
         except KeyboardInterrupt:
             pass
-    else:
-        plt.close(fig)
+    # (save-only figures are not registered with pyplot; nothing to close)
 
     return save_path
 
 def watch_live_overlay(sess: "Session", refresh_sec: float = 60.0) -> None:
-    with connect() as conn:
-        # pick pair (same logic as before) ...
-        if sess.pair:
-            pair = sess.pair
+    import matplotlib.pyplot as plt
+
+    conn = sess.conn
+    # pick pair (same logic as before) ...
+    if sess.pair:
+        pair = sess.pair
+    else:
+        cfg_targets = get_monitored_pairs_from_config()
+        if cfg_targets:
+            pair = cfg_targets[0]
         else:
-            cfg_targets = get_monitored_pairs_from_config()
-            if cfg_targets:
-                pair = cfg_targets[0]
-            else:
-                rows = list_pairs(conn)
-                if not rows:
-                    print("(no pairs to watch — add pairs or runs first)")
-                    return
-                pair = rows[0]["pair_address"]
-
-        meta = get_pair_meta(conn, pair)
-        if not meta:
-            print(f"[watch] no metadata for pair {pair}")
-            return
+            rows = list_pairs(conn)
+            if not rows:
+                print("(no pairs to watch — add pairs or runs first)")
+                return
+            pair = rows[0]["pair_address"]
 
-        bs = (meta.get("base_symbol") or "BASE").upper()
+    meta = get_pair_meta(conn, pair)
+    if not meta:
+        print(f"[watch] no metadata for pair {pair}")
+        return
 
-        plt.ion()
-        fig, ax = plt.subplots()
-        try:
-            fig.canvas.manager.set_window_title(f"Live: {bs} banded S/R")
-        except Exception:
-            pass
+    bs = (meta.get("base_symbol") or "BASE").upper()
+
+    plt.ion()
+    fig, ax = plt.subplots()
+    try:
+        fig.canvas.manager.set_window_title(f"Live: {bs} banded S/R")
+    except Exception:
+        pass
 
-        # cache fixed y-lims if you dislike bouncing; set to None for auto each refresh
-        fixed_ylim = None  # e.g., fixed_ylim = (0.0001, 0.002)
-
-        def redraw(_evt=None):
-            ax.clear()
-            times, tok_usd, per_run_points, runs = build_series(conn, pair, limit=sess.limit, smooth=sess.smooth)
-            if times:
-                if fixed_ylim:
-                    ymin, ymax = fixed_ylim
-                else:
-                    ymin, ymax = _pad_minmax(tok_usd, pad_ratio=0.2)
-                ax.set_ylim(ymin, ymax)
-
-                for i in range(len(times) - 1):
-                    xseg = [times[i], times[i + 1]]
-                    y0, y1 = tok_usd[i], tok_usd[i + 1]
-                    pts = per_run_points[i]
-                    _, weights_norm, sup_alphas, res_alphas = _per_rung_strengths(pts, weight_exp=sess.weight_exp)
-
-                    _draw_banded_side(ax, xseg, y0, y1, ymin, ymin, weights_norm, sup_alphas, "green")
-                    _draw_banded_side(ax, xseg, y0, y1, ymax, ymax, weights_norm, res_alphas, "red")
-
-                    seg_sup = sum(w * a for w, a in zip(weights_norm, sup_alphas))
-                    seg_res = sum(w * a for w, a in zip(weights_norm, res_alphas))
-                    seg_sum = seg_sup + seg_res
-                    if seg_sum <= 1e-6:
-                        line_color, line_alpha = "black", 0.6
-                    else:
-                        if seg_sup >= seg_res:
-                            line_color = "green"; dom = seg_sup - seg_res
-                        else:
-                            line_color = "red"; dom = seg_res - seg_sup
-                        line_alpha = 0.35 + 0.65 * (dom / seg_sum)
-                    ax.plot(xseg, [y0, y1], color=line_color, alpha=line_alpha, linewidth=2.4)
-
-                ax.set_title(f"Live — {bs} S/R Banded Overlay  (exp={sess.weight_exp:.2f}, smooth={sess.smooth})")
-                ax.set_xlabel("Time (UTC)")
-                ax.set_ylabel("USD per 1 BASE")
-                ax.grid(True)
-            else:
-                ax.set_title("No runs yet — waiting for data...")
-                ax.grid(True)
-
-            fig.canvas.draw_idle()
-            fig.canvas.flush_events()
-
-        # first draw
-        redraw()
-
-        # non-blocking timer fires every refresh_sec
-        timer = fig.canvas.new_timer(interval=int(refresh_sec * 1000))
-        timer.add_callback(redraw)
-        timer.start()
+    # cache fixed y-lims if you dislike bouncing; set to None for auto each refresh
+    fixed_ylim = None  # e.g., fixed_ylim = (0.0001, 0.002)
 
+    # artists are created once and updated in place each tick (no ax.clear() rebuild)
+    artists = _new_overlay_artists(ax)
+    ax.set_xlabel("Time (UTC)")
+    ax.set_ylabel("USD per 1 BASE")
+    ax.grid(True)
+
+    # SQL + geometry run on a prefetch thread with its own connection; the GUI timer
+    # only swaps finished frames into the artists, so a slow query never stalls pan/zoom.
+    # A frame is (times, tok_usd, ymin, ymax, geometry), or None while there are no runs.
+    frames: "queue.Queue" = queue.Queue(maxsize=2)
+    stop = threading.Event()
+
+    def build_frame(wconn: sqlite3.Connection):
+        times, tok_usd, per_run_points, runs = build_series(wconn, pair, limit=sess.limit, smooth=sess.smooth)
+        if not len(runs):
+            return None
+        ymin, ymax = fixed_ylim if fixed_ylim else _pad_minmax(tok_usd, pad_ratio=0.2)
+        times, tok_usd, per_run_points = _thin_series(times, tok_usd, per_run_points, _viewport_points(ax))
+        return times, tok_usd, ymin, ymax, _overlay_geometry(times, tok_usd, per_run_points, ymin, ymax, sess.weight_exp)
+
+    def prefetch() -> None:
+        wconn = open_conn()
+        last_key = None
         try:
-            plt.show(block=True)  # hand control to GUI loop; close window to exit
-        except KeyboardInterrupt:
-            pass
+            while not stop.is_set():
+                try:
+                    # most ticks find no new run: skip the fetch/geometry/draw pipeline entirely
+                    key = get_runs_key(wconn, pair)
+                    if key != last_key:
+                        frame = build_frame(wconn)
+                        while True:  # keep only the newest frames; drop the oldest if the GUI lags
+                            try:
+                                frames.put_nowait(frame)
+                                break
+                            except queue.Full:
+                                try:
+                                    frames.get_nowait()
+                                except queue.Empty:
+                                    pass
+                        last_key = key
+                except Exception as e:
+                    print(f"[watch][error] {e!r}")
+                stop.wait(refresh_sec)
         finally:
-            plt.ioff()
+            wconn.close()
+
+    def redraw(_evt=None):
+        got, frame = False, None
+        while True:  # drain: only the latest frame matters
+            try:
+                frame = frames.get_nowait()
+                got = True
+            except queue.Empty:
+                break
+        if not got:
+            return
+
+        if frame is not None:
+            times, tok_usd, ymin, ymax, geometry = frame
+            ax.set_ylim(ymin, ymax)
+            _apply_overlay(ax, artists, times, tok_usd, geometry)
+            ax.set_title(f"Live — {bs} S/R Banded Overlay  (exp={sess.weight_exp:.2f}, smooth={sess.smooth})")
+        else:
+            _clear_overlay(artists)
+            ax.set_title("No runs yet — waiting for data...")
+
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(prefetch)
+
+    # non-blocking timer polls for finished frames (cheap when the queue is empty)
+    timer = fig.canvas.new_timer(interval=int(min(refresh_sec, LIVE_POLL_SEC) * 1000))
+    timer.add_callback(redraw)
+    timer.start()
+
+    try:
+        plt.show(block=True)  # hand control to GUI loop; close window to exit
+    except KeyboardInterrupt:
+        pass
+    finally:
+        timer.stop()
+        stop.set()
+        executor.shutdown(wait=True)
+        plt.ioff()
 
 # --------------------------- Interactive menu -------------------------
 
@@ -487,9 +758,39 @@ class Session:
         self.pair: Optional[str] = pm.get("last_pair") or None  # None => iterate all targets
         self.weight_exp: float = float(pm.get("weight_exp", _PM_DEFAULTS["weight_exp"]))
         self.refresh_sec: float = float(pm.get("refresh_sec", _PM_DEFAULTS["refresh_sec"]))
+        self.dpi: int = int(pm.get("dpi", _PM_DEFAULTS["dpi"]))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._dirty = False  # unsaved changes (see save_to_config / flush)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """One connection for the whole menu session (opened on first use, closed at exit)."""
+        if self._conn is None:
+            self._conn = connect()
+            atexit.register(self._conn.close)
+        return self._conn
+
+    def plot_opts(self) -> Dict[str, Any]:
+        """Keyword args for plot_banded_sr_overlay_for_pair (picklable)."""
+        return {
+            "limit": self.limit,
+            "smooth": self.smooth,
+            "weight_exp": self.weight_exp,
+            "show": self.show,
+            "save": self.save,
+            "outdir": self.outdir,
+            "dpi": self.dpi,
+        }
+
+    # Menu edits only mark the session dirty; flush() does the config.json
+    # read-merge-write once (leaving config, before plotting, on exit).
+    def save_to_config(self) -> None:
+        self._dirty = True
 
     # Persist current session values back to config.json
-    def save_to_config(self) -> None:
+    def flush(self) -> None:
+        if not self._dirty:
+            return
         cfg = load_cfg()
         pm = _get_pm_cfg(cfg)
         pm.update({
@@ -501,8 +802,10 @@ class Session:
             "last_pair": self.pair,
             "weight_exp": float(self.weight_exp),
             "refresh_sec": float(self.refresh_sec),
+            "dpi": int(self.dpi),
         })
         _store_pm_cfg(cfg, pm)
+        self._dirty = False
 
 def pick_pair_menu(conn: sqlite3.Connection, sess: Session) -> None:
     cfg_targets = get_monitored_pairs_from_config()
@@ -555,7 +858,8 @@ def config_menu(sess: Session) -> None:
         print(f"  5) Output directory: {sess.outdir}")
         print(f"  6) Rung weight exponent (USD^exp): {sess.weight_exp:.2f}")
         print(f"  7) Live refresh interval (sec): {sess.refresh_sec:.2f}")
-        print("  8) Back")
+        print(f"  8) Saved PNG DPI: {sess.dpi}")
+        print("  9) Back")
         ch = _inp("> ").strip()
         if ch == "1":
             sess.limit = int(_inp("Max runs to load (e.g., 500): ").strip() or str(sess.limit))
@@ -589,50 +893,76 @@ def config_menu(sess: Session) -> None:
                 print("[err] invalid number")
             sess.save_to_config()
         elif ch == "8":
+            try:
+                sess.dpi = max(30, int(_inp("DPI for saved PNGs (e.g., 96 fast, 150 default): ").strip() or str(sess.dpi)))
+            except Exception:
+                print("[err] invalid integer")
+            sess.save_to_config()
+        elif ch == "9":
+            sess.flush()
             return
         else:
             print("Invalid choice.")
 
-def run_overlay_for_pair(conn: sqlite3.Connection, pair: str, sess: Session) -> None:
+def run_overlay_for_pair(conn: sqlite3.Connection, pair: str, opts: Dict[str, Any]) -> None:
+    """opts: Session.plot_opts() (plain dict, so it also crosses process boundaries)."""
     meta = get_pair_meta(conn, pair)
     if not meta:
         print(f"[skip] no metadata for pair {pair}")
         return
-    path = plot_banded_sr_overlay_for_pair(
-        conn=conn,
-        meta=meta,
-        pair=pair,
-        limit=sess.limit,
-        smooth=sess.smooth,
-        weight_exp=sess.weight_exp,
-        show=sess.show,
-        save=sess.save,
-        outdir=sess.outdir,
-    )
+    path = plot_banded_sr_overlay_for_pair(conn=conn, meta=meta, pair=pair, **opts)
     if path:
         print(f"[saved] {path}")
     else:
         print(f"[skip] no runs for pair {pair}")
 
+def _plot_worker_init() -> None:
+    # workers only render save-only figures; never let them touch a GUI backend
+    import matplotlib
+    matplotlib.use("Agg")
+
+def _overlay_worker(pair: str, opts: Dict[str, Any]) -> None:
+    """ProcessPool entry point: one pair on its own connection."""
+    conn = connect()
+    try:
+        run_overlay_for_pair(conn, pair, opts)
+    finally:
+        conn.close()
+
 def overlay_menu(sess: Session) -> None:
-    with connect() as conn:
-        if sess.pair:
-            targets = [sess.pair]
-        else:
-            cfg_targets = get_monitored_pairs_from_config()
-            targets = cfg_targets if cfg_targets else [r["pair_address"] for r in list_pairs(conn)]
-        if not targets:
-            print("(no pairs found to plot — add pairs or runs first)")
-            _press_enter()
-            return
+    conn = sess.conn
+    if sess.pair:
+        targets = [sess.pair]
+    else:
+        cfg_targets = get_monitored_pairs_from_config()
+        targets = cfg_targets if cfg_targets else [r["pair_address"] for r in list_pairs(conn)]
+    if not targets:
+        print("(no pairs found to plot — add pairs or runs first)")
+        _press_enter()
+        return
 
-        print(f"\n[Banded S/R Overlay] smooth={sess.smooth} weight_exp={sess.weight_exp:.2f} outdir={sess.outdir} save={sess.save} show={sess.show}")
+    print(f"\n[Banded S/R Overlay] smooth={sess.smooth} weight_exp={sess.weight_exp:.2f} outdir={sess.outdir} save={sess.save} show={sess.show}")
+    targets = list(dict.fromkeys(targets))  # same pair twice would race on the output filename
+    opts = sess.plot_opts()
+    workers = min(PLOT_MAX_WORKERS, len(targets))
+    if sess.show or workers <= 1:
+        # interactive windows must stay in this process (and one at a time)
         for p in targets:
-            run_overlay_for_pair(conn, p, sess)
-        _press_enter()
+            run_overlay_for_pair(conn, p, opts)
+    else:
+        # save-only rendering is CPU-bound (Agg + PNG encode) and independent per pair
+        with ProcessPoolExecutor(max_workers=workers, initializer=_plot_worker_init) as ex:
+            list(ex.map(_overlay_worker, targets, [opts] * len(targets)))
+    _press_enter()
 
 def main_menu() -> None:
     sess = Session()  # auto-loads config
+    try:
+        _menu_loop(sess)
+    finally:
+        sess.flush()  # also on Ctrl-C (_inp raises SystemExit)
+
+def _menu_loop(sess: Session) -> None:
     while True:
         print("\n=== Token S/R Banded Overlay ===")
         print("  1) Select pair(s)")
@@ -642,13 +972,14 @@ def main_menu() -> None:
         print("  5) Exit")
         choice = _inp("> ").strip()
         if choice == "1":
-            with connect() as conn:
-                pick_pair_menu(conn, sess)
+            pick_pair_menu(sess.conn, sess)
         elif choice == "2":
             config_menu(sess)
         elif choice == "3":
+            sess.flush()
             overlay_menu(sess)
         elif choice == "4":
+            sess.flush()
             watch_live_overlay(sess, refresh_sec=sess.refresh_sec)
         elif choice == "5":
             print("Bye!")
@@ -5,12 +5,20 @@
 # Reads 0x API key from config.json -> {"0x_api_key": "YOUR_KEY"}  # NOTE: matches this file's current key
 # Hardcoded addresses per request. Both tokens use 18 decimals.
 
-import json
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Any, Optional, List
+from decimal import Context, Decimal, ROUND_DOWN
+
 import requests
-from decimal import Decimal, getcontext, ROUND_DOWN
+
+from http_helper import RETRY_STATUSES, api_headers, pooled_session
+from json_helper import json_dumps, json_loads
 
 ZEROX_PRICE_URL = "https://api.0x.org/swap/allowance-holder/price"
 CHAIN_ID = 8453  # Base
@@ -30,12 +38,40 @@ SELL_TOKEN_AMOUNT_HUMAN = "1000000"   # 1,000,000 BASE_PEPE tokens
 
 CONFIG_FILE = Path("config.json")
 
+# Process-wide request gate: callers may run ladders on several threads, so the
+# 0x rate limit (10 rps) is enforced here rather than by per-caller sleeps alone.
+ZEROX_MAX_RPS = 9
+_RATE_LOCK = threading.Lock()
+_next_slot = 0.0
+
+def _rate_gate() -> None:
+    """Block until the next 0x request slot (min interval 1/ZEROX_MAX_RPS, thread-safe)."""
+    global _next_slot
+    with _RATE_LOCK:
+        now = time.monotonic()
+        wait = _next_slot - now
+        _next_slot = max(now, _next_slot) + 1.0 / ZEROX_MAX_RPS
+    if wait > 0:
+        time.sleep(wait)
+
+# One keep-alive session for all 0x calls: ladder sweeps issue 2N quotes to the
+# same host, so reusing pooled connections skips a TCP+TLS handshake per quote.
+# The urllib3 pool is thread-safe; size it for the concurrent sweep workers.
+# Transient 5xx are retried inside the pool; 429 is not: urllib3's first retry
+# has no backoff and would bypass _rate_gate, so get_price retries it behind the gate.
+ZEROX_POOL_SIZE = 16
+ZEROX_429_RETRIES = 3
+ZEROX_429_BACKOFF_SEC = 0.5  # doubled per attempt unless the response sends Retry-After
+_SESSION = pooled_session(1, ZEROX_POOL_SIZE, retry_statuses=tuple(s for s in RETRY_STATUSES if s != 429))
+
+@lru_cache(maxsize=1)
 def _load_api_key() -> str:
+    """0x API key from config.json, read and parsed once per process (exits on error)."""
     if not CONFIG_FILE.exists():
         sys.stderr.write("ERROR: config.json not found.\n")
         sys.exit(1)
     try:
-        cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+        cfg = json_loads(CONFIG_FILE.read_bytes())
     except Exception as e:
         sys.stderr.write(f"ERROR: failed to parse config.json: {e}\n")
         sys.exit(1)
@@ -48,27 +84,87 @@ def _load_api_key() -> str:
     return key
 
 def _headers(api_key: str) -> Dict[str, str]:
-    return {
-        "accept": "application/json",
-        "0x-api-key": api_key,
-        "0x-version": "v2",
-    }
+    """0x request headers; depend only on the API key, so built once per key (api_headers)."""
+    return api_headers(("0x-api-key", api_key), ("0x-version", "v2"))
+
+# Decimal math runs in one explicit 80-digit context built at import: getcontext()
+# is per thread (ladder parses quotes on pool threads), and mutating it per call
+# was pure overhead. 10**decimals / quantize exponents are cached per precision.
+_DEC_CTX = Context(prec=80)
+_SCALE_CACHE: Dict[int, Decimal] = {}
+_QUANT_CACHE: Dict[int, Decimal] = {}
+
+def _scale(decimals: int) -> Decimal:
+    """Decimal(10) ** decimals, computed once per decimals value."""
+    s = _SCALE_CACHE.get(decimals)
+    if s is None:
+        s = _SCALE_CACHE.setdefault(decimals, Decimal(10) ** decimals)
+    return s
+
+# Fixed-point conversions between base units and plain decimal strings are pure
+# integer/string work (digit slicing / padding); Decimal is only needed for true ratios.
+def _int_to_human(n: int, decimals: int, max_decimals: Optional[int] = None) -> str:
+    """
+    Base units -> plain decimal string (no exponent), trailing zeros trimmed.
+    With max_decimals the fraction is truncated (rounded down) to that many digits.
+    """
+    if not decimals:
+        return str(n)
+    digits = str(abs(n)).rjust(decimals + 1, "0")  # one int->str, then slice at the point
+    whole, frac = digits[:-decimals], digits[-decimals:]
+    if max_decimals is not None:
+        frac = frac[:max_decimals]
+    frac = frac.rstrip("0")
+    sign = "-" if n < 0 and (frac or whole != "0") else ""
+    return f"{sign}{whole}.{frac}" if frac else f"{sign}{whole}"
+
+def _human_to_int(s: str, decimals: int) -> Optional[int]:
+    """
+    Plain "123.45" string -> base units, fraction truncated to decimals digits.
+    None for anything else (sign, exponent, whitespace...): callers fall back to Decimal.
+    """
+    whole, _, frac = s.partition(".")
+    if not (s.isascii() and (whole or frac) and (not whole or whole.isdigit()) and (not frac or frac.isdigit())):
+        return None
+    frac = frac[:decimals].ljust(decimals, "0")
+    return int((whole or "0") + frac)
 
+@lru_cache(maxsize=128)  # callers convert the same few fixed sizes over and over
 def to_base_units(amount_str: str, decimals: int) -> str:
     """
     Convert a human-readable token amount (e.g., "0.01") to base units string
-    for on-chain APIs. Uses Decimal to avoid floating errors.
+    for on-chain APIs. Plain decimal strings take an integer-only path; anything
+    else (signs, exponents, ...) goes through Decimal to avoid floating errors.
     """
-    getcontext().prec = 80
+    fast = _human_to_int(amount_str, decimals)
+    if fast is not None:
+        return str(fast)
     amt = Decimal(amount_str)
-    scale = Decimal(10) ** decimals
     # Truncate toward zero to avoid rounding up unexpectedly
-    base_units = (amt * scale).to_integral_value(rounding=ROUND_DOWN)
+    base_units = _DEC_CTX.multiply(amt, _scale(decimals)).to_integral_value(rounding=ROUND_DOWN, context=_DEC_CTX)
     if base_units < 0:
         raise ValueError("Negative amounts are not allowed.")
     return str(base_units)
 
-def get_price(*, sell_token: str, buy_token: str, sell_amount: str, api_key: str) -> Dict[str, Any]:
+def usd_to_base_units(usd: Decimal, px_usd: Decimal, decimals: int) -> str:
+    """
+    usd / px_usd tokens in base units (str), truncated like to_base_units.
+    Exact bignum int math on the Decimals' integer ratios, so the result does
+    not depend on the caller's (per-thread) Decimal context.
+    """
+    un, ud = Decimal(usd).as_integer_ratio()
+    pn, pd = px_usd.as_integer_ratio()
+    return str(un * pd * 10 ** decimals // (ud * pn))
+
+def _retry_after(r: requests.Response) -> Optional[float]:
+    """Retry-After in seconds if the response sends a numeric one."""
+    try:
+        return max(0.0, float(r.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+def get_price(*, sell_token: str, buy_token: str, sell_amount: str, api_key: str,
+              session: Optional[requests.Session] = None) -> Dict[str, Any]:
     params = {
         "chainId": CHAIN_ID,
         "sellToken": sell_token,
@@ -76,25 +172,31 @@ def get_price(*, sell_token: str, buy_token: str, sell_amount: str, api_key: str
         "sellAmount": sell_amount,
         "slippageBps": 0,  # no extra slippage buffer; raw route pricing
     }
-    r = requests.get(ZEROX_PRICE_URL, headers=_headers(api_key), params=params, timeout=20)
+    for attempt in range(ZEROX_429_RETRIES + 1):
+        _rate_gate()
+        r = (session or _SESSION).get(ZEROX_PRICE_URL, headers=_headers(api_key), params=params, timeout=20)
+        if r.status_code != 429 or attempt == ZEROX_429_RETRIES:
+            break
+        time.sleep(_retry_after(r) or ZEROX_429_BACKOFF_SEC * 2 ** attempt)
     if r.status_code != 200:
-        raise RuntimeError(f"0x price error [{r.status_code}]: {r.text}")
-    return r.json()
+        # decode the body directly: r.text would run charset detection first
+        raise RuntimeError(f"0x price error [{r.status_code}]: {r.content.decode('utf-8', 'replace')}")
+    return json_loads(r.content)
 
 # --------------------------
 # Added: parser for useful fields + derived metrics
 # --------------------------
-from decimal import Decimal, getcontext, ROUND_DOWN
-from typing import Dict, Any, List
-
-getcontext().prec = 80  # high precision for on-chain math
 
 def _fmt_decimal(d: Decimal, max_decimals: int) -> str:
     """Round DOWN to max_decimals and trim trailing zeros."""
-    q = Decimal(1) if max_decimals == 0 else Decimal("1." + "0"*max_decimals)
-    s = format(d.quantize(q, rounding=ROUND_DOWN), "f")
+    q = _QUANT_CACHE.get(max_decimals)
+    if q is None:
+        q = _QUANT_CACHE.setdefault(max_decimals, Decimal(1) if max_decimals == 0 else Decimal("1." + "0"*max_decimals))
+    s = format(d.quantize(q, rounding=ROUND_DOWN, context=_DEC_CTX), "f")
     return s.rstrip("0").rstrip(".") if "." in s else s
 
+_BPS_KEY = itemgetter("proportionBps")
+
 def parse_0x_price_response(resp: Dict[str, Any], *, sell_decimals: int, buy_decimals: int) -> Dict[str, Any]:
     def to_int(x) -> int:
         return int(str(x)) if x is not None else 0
@@ -105,27 +207,29 @@ def parse_0x_price_response(resp: Dict[str, Any], *, sell_decimals: int, buy_dec
     sell_amount = to_int(resp.get("sellAmount"))
     buy_amount  = to_int(resp.get("buyAmount"))
 
-    # Human-readable (apply decimals)
-    sell_hr = Decimal(sell_amount) / (Decimal(10) ** sell_decimals) if sell_amount else Decimal(0)
-    buy_hr  = Decimal(buy_amount)  / (Decimal(10) ** buy_decimals)
+    # Human-readable (apply decimals): integer divmod, no Decimal division
+    sell_hr = _int_to_human(sell_amount, sell_decimals)
+    buy_hr  = _int_to_human(buy_amount, buy_decimals)
+    # Decimal only for the unit-price ratios; scaleb is an exact exponent shift
+    sell_dec = Decimal(sell_amount).scaleb(-sell_decimals, _DEC_CTX)
+    buy_dec  = Decimal(buy_amount).scaleb(-buy_decimals, _DEC_CTX)
 
     # Symbols (if provided in route.tokens)
-    tokens: List[Dict[str, Any]] = (resp.get("route") or {}).get("tokens") or []
-    sym_by_addr = { (t.get("address") or "").lower(): t.get("symbol") for t in tokens }
-    sell_symbol = sym_by_addr.get((sell_token or "").lower())
-    buy_symbol  = sym_by_addr.get((buy_token  or "").lower())
+    route = resp.get("route") or {}
+    tokens: List[Dict[str, Any]] = route.get("tokens") or []
+    sym_by_addr = {a.lower(): t.get("symbol") for t in tokens if (a := t.get("address"))}
+    sell_symbol = sym_by_addr.get(sell_token.lower()) if sell_token else None
+    buy_symbol  = sym_by_addr.get(buy_token.lower()) if buy_token else None
 
     # Route concentration (top source by proportionBps)
-    fills: List[Dict[str, Any]] = (resp.get("route") or {}).get("fills") or []
-    top_source, top_bps = None, -1
-    slim_fills = []
-    for f in fills:
-        src = f.get("source")
-        bps = to_int(f.get("proportionBps"))
-        slim_fills.append({"source": src, "proportionBps": bps})
-        if bps > top_bps:
-            top_bps = bps
-            top_source = src
+    fills: List[Dict[str, Any]] = route.get("fills") or []
+    slim_fills = [{"source": f.get("source"), "proportionBps": to_int(f.get("proportionBps"))} for f in fills]
+    # first fill with the largest share (negative shares never count as a top source)
+    top = max(slim_fills, key=_BPS_KEY, default=None)
+    if top is not None and top["proportionBps"] >= 0:
+        top_source, top_bps = top["source"], top["proportionBps"]
+    else:
+        top_source, top_bps = None, -1
     route_concentration_pct = float(Decimal(top_bps) / Decimal(100)) if top_bps >= 0 else 0.0
 
     # Fees & gas
@@ -142,18 +246,18 @@ def parse_0x_price_response(resp: Dict[str, Any], *, sell_decimals: int, buy_dec
 
         # human-readable actual trade amounts
         # sell: show up to 8 decimals; buy: default to whole tokens (round down)
-        "sell_amount_human": str(sell_hr),
-        "sell_amount_human_str": _fmt_decimal(sell_hr, 8),
-        "buy_amount_human": str(buy_hr),
-        "buy_amount_human_str": _fmt_decimal(buy_hr, 8),
+        "sell_amount_human": sell_hr,
+        "sell_amount_human_str": _int_to_human(sell_amount, sell_decimals, 8),
+        "buy_amount_human": buy_hr,
+        "buy_amount_human_str": _int_to_human(buy_amount, buy_decimals, 8),
 
         # symbols if available
         "sell_symbol": sell_symbol,
         "buy_symbol":  buy_symbol,
 
         # convenience (still keep unit prices if you want them later)
-        "unit_price_human": str(buy_hr / sell_hr) if sell_hr else "0",
-        "unit_price_human_inverted": str(sell_hr / buy_hr) if buy_hr else "0",
+        "unit_price_human": str(_DEC_CTX.divide(buy_dec, sell_dec)) if sell_amount else "0",
+        "unit_price_human_inverted": str(_DEC_CTX.divide(sell_dec, buy_dec)) if buy_amount else "0",
 
         # liquidity & routing
         "liquidity_available": bool(resp.get("liquidityAvailable")),
@@ -177,7 +281,7 @@ def parse_0x_price_response(resp: Dict[str, Any], *, sell_decimals: int, buy_dec
 
 def pretty(title: str, data: Dict[str, Any]) -> None:
     print(f"\n=== {title} ===")
-    print(json.dumps(data, indent=2, ensure_ascii=False))
+    print(json_dumps(data, indent=True))
 
 def print_parsed(title: str, parsed: Dict[str, Any]) -> None:
     print(f"\n--- {title} (parsed) ---")
@@ -198,14 +302,18 @@ def main():
     sell_weth_amount = to_base_units(SELL_WETH_AMOUNT_HUMAN, DECIMALS_WETH)
     sell_token_amount = to_base_units(SELL_TOKEN_AMOUNT_HUMAN, DECIMALS_TOKEN)
 
-    # 1) Indicative price: sell WETH -> buy BASE_PEPE
+    # Both quotes are independent: issue them together over the pooled session
+    # (overlapping network waits), then report in the usual order.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        # 1) Indicative price: sell WETH -> buy BASE_PEPE
+        fut1 = ex.submit(partial(get_price, sell_token=WETH, buy_token=BASE_PEPE,
+                                 sell_amount=sell_weth_amount, api_key=api_key))
+        # 2) Indicative price: sell BASE_PEPE -> buy WETH
+        fut2 = ex.submit(partial(get_price, sell_token=BASE_PEPE, buy_token=WETH,
+                                 sell_amount=sell_token_amount, api_key=api_key))
+
     try:
-        p1 = get_price(
-            sell_token=WETH,
-            buy_token=BASE_PEPE,
-            sell_amount=sell_weth_amount,
-            api_key=api_key,
-        )
+        p1 = fut1.result()
         # raw (optional)
         # pretty(f"Price: sell {SELL_WETH_AMOUNT_HUMAN} WETH -> buy BASE_PEPE", p1)
         # parsed
@@ -214,14 +322,8 @@ def main():
     except Exception as e:
         sys.stderr.write(f"[sell WETH] {e}\n")
 
-    # 2) Indicative price: sell BASE_PEPE -> buy WETH
     try:
-        p2 = get_price(
-            sell_token=BASE_PEPE,
-            buy_token=WETH,
-            sell_amount=sell_token_amount,
-            api_key=api_key,
-        )
+        p2 = fut2.result()
         # raw (optional)
         # pretty(f"Price: sell {SELL_TOKEN_AMOUNT_HUMAN} BASE_PEPE -> buy WETH", p2)
         # parsed
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# test_controller.py
+#
+# Offline checks for controller.py (no 0x/Birdeye calls).
+# Run: python -m unittest test_controller
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# db_helper resolves its DB path at import: point it at a scratch DB first
+_TMP = tempfile.TemporaryDirectory()
+os.environ["DLI_DB_PATH"] = str(Path(_TMP.name) / "liquidity.db")
+
+import controller  # noqa: E402
+from init_db import init_db  # noqa: E402
+
+
+class RunOnceEmptyDbTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cwd = os.getcwd()
+        os.chdir(_TMP.name)  # controller reads/writes ./config.json
+        Path("config.json").write_text(json.dumps({"chain_id": 8453}), encoding="utf-8")
+        init_db(Path(os.environ["DLI_DB_PATH"]))
+
+    def tearDown(self) -> None:
+        os.chdir(self._cwd)
+
+    def test_all_pairs_on_empty_db_is_a_noop(self) -> None:
+        self.assertEqual(controller.list_pair_addresses(), [])
+        self.assertEqual(controller.run_once(None, True, None, None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,15 +4,17 @@
 # Populate DB with the largest-liquidity pool for the given Base token.
 # Uses db_helper.upsert_token_pair (reads DB path from config.json).
 
-import json
 import os
 import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import requests
 
 from db_helper import upsert_token_pair  # uses config.json for DB path
+from http_helper import pooled_session
+from json_helper import json_loads
+from token_price import birdeye_headers  # cached per (api_key, chain)
 
 # ====== USER SETTINGS ======
 token_address = "0x532f27101965dd16442E59d40670FaF5eBB142E4"  # Base token contract (0x...)
@@ -20,14 +22,17 @@ token_address = "0x532f27101965dd16442E59d40670FaF5eBB142E4"  # Base token contr
 # ====== CONSTANTS ======
 CONFIG_FILE = "config.json"
 BIRDEYE_MARKETS_URL = "https://public-api.birdeye.so/defi/v2/markets"
-EVMA_RE = re.compile(r"^0x[a-fA-F0-9]{40}$")
+EVMA_RE = re.compile(r"0x[a-fA-F0-9]{40}")  # used with fullmatch (no anchors needed)
+
+# Pooled keep-alive session (same profile as token_price): callers that import
+# birdeye_get reuse the TCP/TLS connection and back off on rate limits / gateway errors.
+_SESSION = pooled_session(4, 4)
 
 def load_config(path: Path) -> dict:
     if not path.exists():
         return {}
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(path.read_bytes())
     except Exception:
         return {}
 
@@ -35,18 +40,17 @@ def get_api_key(cfg: dict) -> str:
     return cfg.get("birdeye_api_key") or os.getenv("BIRDEYE_API_KEY")
 
 def is_valid_evm_address(addr: str) -> bool:
-    return isinstance(addr, str) and bool(EVMA_RE.match(addr.strip()))
-
-def birdeye_get(url: str, api_key: str, params: dict) -> Dict[str, Any]:
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": api_key,
-        "x-chain": "base",  # critical: treat 0x addresses as Base (not Solana)
-    }
-    resp = requests.get(url, headers=headers, params=params, timeout=20)
+    # callers strip once at the boundary (see main); no per-call strip() copy here
+    return isinstance(addr, str) and len(addr) == 42 and EVMA_RE.fullmatch(addr) is not None
+
+def birdeye_get(url: str, api_key: str, params: dict,
+                session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    # x-chain "base" is critical: treat 0x addresses as Base (not Solana)
+    resp = (session or _SESSION).get(url, headers=birdeye_headers(api_key, "base"), params=params, timeout=20)
     if resp.status_code != 200:
-        raise RuntimeError(f"Birdeye request failed [{resp.status_code}]: {resp.text}")
-    return resp.json()
+        # decode the body directly: resp.text would run charset detection first
+        raise RuntimeError(f"Birdeye request failed [{resp.status_code}]: {resp.content.decode('utf-8', 'replace')}")
+    return json_loads(resp.content)
 
 def normalize_markets(obj: Dict[str, Any]) -> List[Dict[str, Any]]:
     markets = obj.get("data") or obj.get("markets") or []
@@ -56,23 +60,26 @@ def normalize_markets(obj: Dict[str, Any]) -> List[Dict[str, Any]]:
             markets = [markets]
     return markets if isinstance(markets, list) else []
 
+def _liq(m: Dict[str, Any]) -> float:
+    """A market's liquidity as a float; missing/unparsable/NaN -> 0.0."""
+    liq = m.get("liquidity")
+    try:
+        v = float(liq) if liq is not None else 0.0
+    except Exception:
+        return 0.0
+    return v if v == v else 0.0
+
 def pick_largest_by_liquidity(markets: List[Dict[str, Any]]) -> Dict[str, Any]:
-    best, best_liq = None, -1.0
-    for m in markets:
-        liq = m.get("liquidity")
-        try:
-            v = float(liq) if liq is not None else 0.0
-        except Exception:
-            v = 0.0
-        if v > best_liq:
-            best_liq, best = v, m
+    # C-level max drives the loop; ties keep the first market, like the old strict '>' scan
+    best = max(markets, key=_liq, default=None)
     if not best:
         raise ValueError("No market with liquidity found.")
     return best
 
 def main():
-    # 1) Sanity
-    if not is_valid_evm_address(token_address):
+    # 1) Sanity (normalize once at the boundary)
+    token = token_address.strip()
+    if not is_valid_evm_address(token):
         sys.stderr.write("ERROR: token_address must be a 42-char EVM address (0x...).\n")
         sys.exit(1)
 
@@ -85,7 +92,7 @@ def main():
 
     # 3) Fetch markets
     try:
-        resp = birdeye_get(BIRDEYE_MARKETS_URL, api_key, {"address": token_address})
+        resp = birdeye_get(BIRDEYE_MARKETS_URL, api_key, {"address": token})
     except RuntimeError as e:
         if "invalid format" in str(e).lower():
             sys.stderr.write(
@@ -109,7 +116,7 @@ def main():
 
     b_addr = (base.get("address") or "")
     q_addr = (quote.get("address") or "")
-    in_addr = token_address
+    in_addr = token
 
     if in_addr == b_addr:
         base_addr, base_sym, base_dec = b_addr, base.get("symbol"), base.get("decimals")
@@ -3,18 +3,23 @@
 # Pull symbol + price for a single token via Birdeye "Token - Overview",
 # then upsert into SQLite (token_prices_live).
 
-import json
 import sys
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 import requests
 
 # import your DB helper (expects DB_PATH inside it from config.json or default)
 from db_helper import upsert_token_price
+from http_helper import api_headers, pooled_session
+from json_helper import json_loads
 
 BIRDEYE_URL = "https://public-api.birdeye.so/defi/token_overview"
 CONFIG_FILE = Path("config.json")
 
+# Pooled keep-alive session: ladder runs fall back to Birdeye on every live-price
+# miss, so reuse the TCP/TLS connection and back off on rate limits / gateway errors.
+_SESSION = pooled_session(4, 4)
+
 # --- Token to query: WETH (Base) ---
 CA = "0x4200000000000000000000000000000000000006"  # WETH on Base
 
@@ -23,7 +28,7 @@ def load_cfg() -> Dict[str, Any]:
         sys.stderr.write("ERROR: config.json not found\n")
         sys.exit(1)
     try:
-        cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+        cfg = json_loads(CONFIG_FILE.read_bytes())
     except Exception as e:
         sys.stderr.write(f"ERROR: failed to parse config.json: {e}\n")
         sys.exit(1)
@@ -34,33 +39,35 @@ def load_cfg() -> Dict[str, Any]:
     chain_id = cfg.get("chain_id", 8453)
     return {"api_key": api_key, "chain_id": int(chain_id)}
 
+# chain_id -> Birdeye x-chain name (constant; built once at import)
+_CHAIN_BY_ID: Dict[int, str] = {
+    8453: "base",
+    1: "ethereum",
+    56: "bsc",
+    # extend as needed (e.g., 137: "polygon") if Birdeye supports it
+}
+
 def chain_from_id(chain_id: int) -> str:
-    mapping = {
-        8453: "base",
-        1: "ethereum",
-        56: "bsc",
-        # extend as needed (e.g., 137: "polygon") if Birdeye supports it
-    }
-    if chain_id not in mapping:
-        raise ValueError(f"Unsupported/unknown chain_id for Birdeye: {chain_id}")
-    return mapping[chain_id]
+    try:
+        return _CHAIN_BY_ID[chain_id]  # single lookup; fails fast on unknown ids
+    except KeyError:
+        raise ValueError(f"Unsupported/unknown chain_id for Birdeye: {chain_id}") from None
 
 def birdeye_headers(api_key: str, chain_name: str) -> Dict[str, str]:
-    return {
-        "accept": "application/json",
-        "X-API-KEY": api_key,
-        "x-chain": chain_name,
-    }
+    """Birdeye request headers, built once per (api_key, chain) (api_headers)."""
+    return api_headers(("X-API-KEY", api_key), ("x-chain", chain_name))
 
-def fetch_token_overview(ca: str, api_key: str, chain_name: str) -> Dict[str, Any]:
+def fetch_token_overview(ca: str, api_key: str, chain_name: str,
+                         session: Optional[requests.Session] = None) -> Dict[str, Any]:
     params = {"address": ca}
-    r = requests.get(BIRDEYE_URL, headers=birdeye_headers(api_key, chain_name), params=params, timeout=20)
+    r = (session or _SESSION).get(BIRDEYE_URL, headers=birdeye_headers(api_key, chain_name), params=params, timeout=20)
     if r.status_code != 200:
-        raise RuntimeError(f"Birdeye error [{r.status_code}]: {r.text}")
+        # decode the body directly: r.text would run charset detection first
+        raise RuntimeError(f"Birdeye error [{r.status_code}]: {r.content.decode('utf-8', 'replace')}")
     try:
-        return r.json()
+        return json_loads(r.content)
     except Exception as e:
-        raise RuntimeError(f"Failed to decode JSON: {e}; body={r.text[:300]}")
+        raise RuntimeError(f"Failed to decode JSON: {e}; body={r.content[:300].decode('utf-8', 'replace')}")
 
 def extract_symbol_price(payload: Dict[str, Any]) -> Tuple[str, float]:
     """
@@ -80,7 +87,8 @@ def extract_symbol_price(payload: Dict[str, Any]) -> Tuple[str, float]:
         market = data.get("market") or {}
         price = market.get("price") or market.get("priceUsd")
     if symbol == "" or price is None:
-        raise RuntimeError(f"Unexpected schema; cannot find symbol/price in: {json.dumps(data)[:400]}")
+        # truncated repr: no JSON encode of the whole payload just for a message
+        raise RuntimeError("Unexpected schema; cannot find symbol/price in: %.400r" % (data,))
     return str(symbol), float(price)
 
 def main() -> None: